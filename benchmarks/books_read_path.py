@@ -0,0 +1,128 @@
+"""
+Comparing the books read paths: ORM hydration with the selectin
+genres load against the single-query Core projection.
+
+Seeds books into the configured database inside a transaction
+that is rolled back at the end, so it can be run against
+a development database:
+
+    python -m benchmarks.books_read_path --rows 100000 --rounds 3
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+from src.db.database import async_session_maker
+from src.models.books import Books
+from src.models.books_genres import BooksGenres
+from src.models.genres import Genres
+from src.models.users import Users
+from src.repositories.books import BooksRepository
+from src.utils.repository import BaseRepository
+
+GENRES_PER_BOOK = 2
+GENRES_QUANTITY = 10
+
+
+async def seed(repo: BooksRepository, rows: int) -> int:
+    """
+    Creating an author with books and genres.
+    :param repo: Books repository.
+    :param rows: Number of books.
+    :return: Author ID.
+    """
+    session = repo.session
+    author_id = (await session.execute(
+        insert(Users)
+        .values(first_name="Bench", last_name="Author")
+        .returning(Users.id)
+    )).scalar_one()
+    genre_ids = (await session.execute(
+        insert(Genres).returning(Genres.id),
+        [{"name": f"bench-genre-{i}"} for i in range(GENRES_QUANTITY)],
+    )).scalars().all()
+    book_ids = (await session.execute(
+        insert(Books).returning(Books.id, sort_by_parameter_order=True),
+        [
+            {"name": f"Book {i}", "price": 1 + i % 100, "author_id": author_id}
+            for i in range(rows)
+        ],
+    )).scalars().all()
+    await session.execute(
+        insert(BooksGenres),
+        [
+            {
+                "book_id": book_id,
+                "genre_id": genre_ids[(i + shift) % GENRES_QUANTITY],
+            }
+            for i, book_id in enumerate(book_ids)
+            for shift in range(GENRES_PER_BOOK)
+        ],
+    )
+    await session.flush()
+    return author_id
+
+
+async def measure(name: str, read, rounds: int) -> None:
+    """
+    Running a read path and printing the best throughput
+    and the peak memory allocated by Python.
+    :param name: Read path name.
+    :param read: Coroutine function returning the read rows.
+    :param rounds: Number of rounds.
+    :return: None.
+    """
+    best_rate, best_peak = 0.0, None
+    for _ in range(rounds):
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = await read()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        best_rate = max(best_rate, len(rows) / elapsed)
+        best_peak = peak if best_peak is None else min(best_peak, peak)
+        del rows
+    print(
+        f"{name:<12} {best_rate:>12,.0f} rows/s "
+        f"{best_peak / 2 ** 20:>10.1f} MiB peak"
+    )
+
+
+async def main(rows: int, rounds: int) -> None:
+    """
+    Seeding the books and comparing the read paths.
+    :param rows: Number of books.
+    :param rounds: Number of rounds.
+    :return: None.
+    """
+    async with async_session_maker() as session:
+        repo = BooksRepository(session)
+        try:
+            author_id = await seed(repo, rows)
+            only_seeded = Books.author_id == author_id
+
+            async def read_orm():
+                session.expunge_all()
+                return await BaseRepository.find_all(repo, only_seeded)
+
+            async def read_projection():
+                session.expunge_all()
+                return await repo.find_all(only_seeded)
+
+            print(f"{rows:,} books, {GENRES_PER_BOOK} genres each")
+            await measure("orm", read_orm, rounds)
+            await measure("projection", read_projection, rounds)
+        finally:
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Books read path benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.rounds))
@@ -1,5 +1,6 @@
 #!/bin/bash
 
+alembic upgrade head
 alembic revision --autogenerate
 alembic upgrade head
 gunicorn src.main:app --worker-class uvicorn.workers.UvicornWorker --bind=0.0.0.0:8000
\ No newline at end of file
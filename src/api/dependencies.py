@@ -1,10 +1,63 @@
+from functools import partial
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import (
+    Depends,
+    Request,
+    Response,
+)
 
+from src.config.config import settings
 from src.utils.transaction import (
     BaseManager,
     TransactionManager,
 )
 
-TransactionDep = Annotated[BaseManager, Depends(TransactionManager)]
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
+
+
+def set_read_your_writes_cookie(response: Response) -> None:
+    """
+    Sending the client to the primary for its reads
+    during the read-your-writes window.
+    :param response: Response of the request.
+    :return: None.
+    """
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        "1",
+        max_age=settings.db.READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+    )
+
+
+def get_transaction(response: Response) -> BaseManager:
+    """
+    Getting a transaction manager of the request on the primary.
+    Once a write is committed, the client reads from the primary too
+    for the read-your-writes window after the request.
+    :param response: Response of the request.
+    :return: Transaction manager.
+    """
+    if not settings.db.READ_YOUR_WRITES_SECONDS:
+        return TransactionManager()
+    return TransactionManager(
+        on_commit=partial(set_read_your_writes_cookie, response),
+    )
+
+
+def get_read_transaction(request: Request) -> BaseManager:
+    """
+    Getting a read-only transaction manager of the request
+    on a replica, or on the primary within
+    the read-your-writes window of the client.
+    :param request: Request.
+    :return: Transaction manager.
+    """
+    if READ_YOUR_WRITES_COOKIE in request.cookies:
+        return TransactionManager()
+    return TransactionManager(read_only=True)
+
+
+TransactionDep = Annotated[BaseManager, Depends(get_transaction)]
+ReadTransactionDep = Annotated[BaseManager, Depends(get_read_transaction)]
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from src.api.v1.bookings import router as bookings_router
 from src.api.v1.books import router as books_router
 from src.api.v1.genres import router as genres_router
+from src.api.v1.internal import router as internal_router
 from src.api.v1.users import router as users_router
 from src.config.config import settings
 
@@ -11,6 +12,7 @@ routers = (
     books_router,
     users_router,
     genres_router,
+    internal_router,
 )
 
 router_v1 = APIRouter(prefix=settings.api.V1_PREFIX)
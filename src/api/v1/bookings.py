@@ -2,24 +2,37 @@ from typing import Annotated
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
     Path,
+    Query,
     status,
 )
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import TransactionDep
-from src.api.pagination import (
-    BasePaginationResponse,
-    PaginationParams,
-    Paginator,
+from src.api.dependencies import (
+    ReadTransactionDep,
+    TransactionDep,
 )
+from src.config.config import settings
+from src.schemas.batch import BatchIdsSchema
 from src.schemas.bookings import (
     AddBookingSchema,
+    AddHoldSchema,
+    BookingConflictSchema,
     BookingIdSchema,
     BookingSchema,
+    CheckBookingSchema,
+    HoldSchema,
     UpdateBookingSchema,
 )
+from src.schemas.export import ExportFormat
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
 from src.services.bookings import BookingsService
+from src.utils.export import MEDIA_TYPES
 
 router = APIRouter(
     prefix="/bookings",
@@ -34,7 +47,7 @@ router = APIRouter(
     description="Get all bookings with pagination.",
 )
 async def get_all_bookings(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     pagination: PaginationParams = Depends(),
 ) -> BasePaginationResponse[BookingSchema]:
     """
@@ -43,14 +56,40 @@ async def get_all_bookings(
     :param pagination: Pagination params.
     :return: List of Pydantic models representing the bookings.
     """
-    list_bookings = await BookingsService.get_all_bookings(
+    return await BookingsService.get_all_bookings(
         transaction,
+        pagination,
     )
-    paginator = Paginator(
-        pages=list_bookings,
-        params=pagination,
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all bookings",
+    description="Stream all bookings as NDJSON or CSV.",
+)
+async def export_bookings(
+    transaction: ReadTransactionDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    """
+    Exporting all bookings.
+    :param transaction: Database transaction.
+    :param export_format: Export format.
+    :return: Streaming response with the serialized bookings.
+    """
+    return StreamingResponse(
+        BookingsService.export_bookings(
+            transaction,
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=bookings.{export_format.value}"
+            ),
+        },
     )
-    return paginator.get_response()
 
 
 @router.get(
@@ -60,7 +99,7 @@ async def get_all_bookings(
     description="Get booking by ID.",
 )
 async def get_booking(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     booking_id: Annotated[int, Path(ge=1)],
 ) -> BookingSchema:
     """
@@ -97,6 +136,84 @@ async def add_booking(
     )
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Add bookings in batch",
+    description="Add many bookings in a single transaction. "
+                "Nothing is written if any of the bookings is invalid, "
+                "the errors are reported per item index.",
+)
+async def add_bookings(
+    transaction: TransactionDep,
+    bookings_data: Annotated[
+        list[AddBookingSchema],
+        Body(min_length=1, max_length=settings.batch.MAX_SIZE),
+    ],
+) -> BatchIdsSchema:
+    """
+    Adding bookings in batch.
+    :param transaction: Database transaction.
+    :param bookings_data: List of Pydantic models representing booking data.
+    :return: Pydantic model representing the created bookings IDs.
+    """
+    return await BookingsService.add_bookings(
+        transaction,
+        bookings_data,
+    )
+
+
+@router.post(
+    "/check",
+    status_code=status.HTTP_200_OK,
+    summary="Check bookings availability",
+    description="Check many books on the requested dates at once "
+                "and return the conflicting bookings per item index.",
+)
+async def check_bookings(
+    transaction: TransactionDep,
+    periods: Annotated[
+        list[CheckBookingSchema],
+        Body(min_length=1, max_length=settings.batch.MAX_SIZE),
+    ],
+) -> list[BookingConflictSchema]:
+    """
+    Checking the availability of books.
+    :param transaction: Database transaction.
+    :param periods: List of Pydantic models representing
+                    the requested books and dates.
+    :return: List of Pydantic models representing the conflicts.
+    """
+    return await BookingsService.check_bookings(
+        transaction,
+        periods,
+    )
+
+
+@router.post(
+    "/holds",
+    status_code=status.HTTP_201_CREATED,
+    summary="Hold a book",
+    description="Hold a book on the requested dates while the booking "
+                "is confirmed. Other users cannot book or hold it "
+                "until the hold expires or a booking with its ID is saved.",
+)
+async def add_hold(
+    transaction: TransactionDep,
+    hold_data: AddHoldSchema,
+) -> HoldSchema:
+    """
+    Holding a book.
+    :param transaction: Database transaction.
+    :param hold_data: Pydantic model representing hold data.
+    :return: Pydantic model representing the hold.
+    """
+    return await BookingsService.add_hold(
+        transaction,
+        hold_data,
+    )
+
+
 @router.put(
     "/{booking_id}",
     status_code=status.HTTP_200_OK,
@@ -1,27 +1,45 @@
+from datetime import date
 from typing import Annotated
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
+    Header,
     Path,
     Query,
+    Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import TransactionDep
-from src.api.pagination import (
-    BasePaginationResponse,
-    PaginationParams,
-    Paginator,
+from src.api.dependencies import (
+    ReadTransactionDep,
+    TransactionDep,
 )
+from src.config.config import settings
+from src.schemas.batch import BatchIdsSchema
+from src.schemas.bookings import BookAvailabilitySchema
 from src.schemas.books import (
+    AddBookBatchSchema,
     AddBookSchema,
     BookIdSchema,
     BookFiltersSchema,
     BookSchema,
     UpdateBookSchema,
 )
+from src.schemas.export import ExportFormat
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
+from src.services.bookings import BookingsService
 from src.services.books import BooksService
+from src.utils.etags import (
+    etag_matches,
+    get_row_etag,
+)
+from src.utils.export import MEDIA_TYPES
 
 router = APIRouter(
     prefix="/books",
@@ -33,26 +51,38 @@ router = APIRouter(
     "/all",
     status_code=status.HTTP_200_OK,
     summary="Get all books",
-    description="Get all books with pagination.",
+    description="Get all books with pagination. "
+                "Answers a matching `If-None-Match` with 304.",
 )
 async def get_all_books(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
+    response: Response,
     pagination: PaginationParams = Depends(),
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> BasePaginationResponse[BookSchema]:
     """
     Getting all books.
     :param transaction: Database transaction.
+    :param response: Response of the request.
     :param pagination: Pagination params.
+    :param if_none_match: ETags of the page cached by the client.
     :return: List of Pydantic models representing the book.
     """
-    list_books = await BooksService.get_all_books(
+    etag = await BooksService.get_all_books_etag(
         transaction,
+        pagination,
     )
-    paginator = Paginator(
-        pages=list_books,
-        params=pagination,
+    if etag:
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+        response.headers["ETag"] = etag
+    return await BooksService.get_all_books(
+        transaction,
+        pagination,
     )
-    return paginator.get_response()
 
 
 @router.get(
@@ -62,7 +92,7 @@ async def get_all_books(
     description="Get books by filters with pagination.",
 )
 async def get_books_by_filters(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     pagination: PaginationParams = Depends(),
     filters: BookFiltersSchema = Depends(),
     genres: list[str] = Query(None)
@@ -75,38 +105,121 @@ async def get_books_by_filters(
     :param genres: List of genres.
     :return: List of Pydantic models representing the book.
     """
-    list_books = await BooksService.get_books_by_filters(
+    return await BooksService.get_books_by_filters(
         transaction,
         filters,
         genres,
+        pagination,
     )
-    paginator = Paginator(
-        pages=list_books,
-        params=pagination,
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export books by filters",
+    description="Stream all books matching the filters as NDJSON or CSV.",
+)
+async def export_books(
+    transaction: ReadTransactionDep,
+    filters: BookFiltersSchema = Depends(),
+    genres: list[str] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    """
+    Exporting books by filters.
+    :param transaction: Database transaction.
+    :param filters: Pydantic model representing the search filters.
+    :param genres: List of genres.
+    :param export_format: Export format.
+    :return: Streaming response with the serialized books.
+    """
+    return StreamingResponse(
+        BooksService.export_books(
+            transaction,
+            filters,
+            genres,
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=books.{export_format.value}"
+            ),
+        },
+    )
+
+
+@router.get(
+    "/availability",
+    status_code=status.HTTP_200_OK,
+    summary="Get availability of books",
+    description="Get the busy and free periods of many books "
+                "between two dates (both inclusive).",
+)
+async def get_books_availability(
+    transaction: ReadTransactionDep,
+    book_ids: list[int] = Query(
+        ...,
+        min_length=1,
+        max_length=settings.bookings.AVAILABILITY_MAX_BOOKS,
+    ),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+) -> list[BookAvailabilitySchema]:
+    """
+    Getting the availability of books.
+    :param transaction: Database transaction.
+    :param book_ids: Books IDs.
+    :param date_from: Window start date.
+    :param date_to: Window end date.
+    :return: List of Pydantic models representing
+             the availability of the books.
+    """
+    return await BookingsService.get_availability(
+        transaction,
+        book_ids,
+        date_from,
+        date_to,
     )
-    return paginator.get_response()
 
 
 @router.get(
     "/{book_id}",
     status_code=status.HTTP_200_OK,
     summary="Get book by ID",
-    description="Get book by ID.",
+    description="Get book by ID. "
+                "Answers a matching `If-None-Match` with 304.",
 )
 async def get_book(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
+    response: Response,
     book_id: Annotated[int, Path(ge=1)],
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> BookSchema:
     """
     Getting a book by ID.
     :param transaction: Database transaction.
+    :param response: Response of the request.
     :param book_id: Book ID.
+    :param if_none_match: ETags of the book cached by the client.
     :return: Pydantic model representing the book.
     """
-    return await BooksService.get_book(
+    if if_none_match:
+        etag = await BooksService.get_book_etag(
+            transaction,
+            book_id,
+        )
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+    book = await BooksService.get_book(
         transaction,
         book_id,
     )
+    response.headers["ETag"] = get_row_etag("books", book.id, book.version)
+    return book
 
 
 @router.post(
@@ -134,6 +247,33 @@ async def add_book(
     )
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Add books in batch",
+    description="Add many books in a single transaction. "
+                "Nothing is written if any of the books is invalid, "
+                "the errors are reported per item index.",
+)
+async def add_books(
+    transaction: TransactionDep,
+    books_data: Annotated[
+        list[AddBookBatchSchema],
+        Body(min_length=1, max_length=settings.batch.MAX_SIZE),
+    ],
+) -> BatchIdsSchema:
+    """
+    Adding books in batch.
+    :param transaction: Database transaction.
+    :param books_data: List of Pydantic models representing book data.
+    :return: Pydantic model representing the created books IDs.
+    """
+    return await BooksService.add_books(
+        transaction,
+        books_data,
+    )
+
+
 @router.put(
     "/{book_id}",
     status_code=status.HTTP_200_OK,
@@ -2,24 +2,32 @@ from typing import Annotated
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
+    Header,
     Path,
+    Response,
     status,
 )
 
-from src.api.dependencies import TransactionDep
-from src.api.pagination import (
-    BasePaginationResponse,
-    PaginationParams,
-    Paginator,
+from src.api.dependencies import (
+    ReadTransactionDep,
+    TransactionDep,
 )
+from src.config.config import settings
+from src.schemas.batch import BatchIdsSchema
 from src.schemas.genres import (
     AddGenreSchema,
     GenreIdSchema,
     GenreSchema,
     UpdateGenreSchema,
 )
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
 from src.services.genres import GenresService
+from src.utils.etags import etag_matches
 
 router = APIRouter(
     prefix="/genres",
@@ -31,26 +39,38 @@ router = APIRouter(
     "/all",
     status_code=status.HTTP_200_OK,
     summary="Get all genres.",
-    description="Get all genres with pagination.",
+    description="Get all genres with pagination. "
+                "Answers a matching `If-None-Match` with 304.",
 )
 async def get_all_genres(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
+    response: Response,
     pagination: PaginationParams = Depends(),
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> BasePaginationResponse[GenreSchema]:
     """
     Getting all genres.
     :param transaction: Database transaction.
+    :param response: Response of the request.
     :param pagination: Pagination params.
+    :param if_none_match: ETags of the page cached by the client.
     :return: List of Pydantic models representing the genre.
     """
-    list_genres = await GenresService.get_all_genres(
+    etag = await GenresService.get_all_genres_etag(
         transaction,
+        pagination,
     )
-    paginator = Paginator(
-        pages=list_genres,
-        params=pagination,
+    if etag:
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+        response.headers["ETag"] = etag
+    return await GenresService.get_all_genres(
+        transaction,
+        pagination,
     )
-    return paginator.get_response()
 
 
 @router.get(
@@ -60,7 +80,7 @@ async def get_all_genres(
     description="Get genre by ID",
 )
 async def get_genre(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     genre_id: Annotated[int, Path(ge=1)],
 ) -> GenreSchema:
     """
@@ -97,6 +117,33 @@ async def add_genre(
     )
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Add genres in batch",
+    description="Add many genres in a single transaction. "
+                "Nothing is written if any of the genres is invalid, "
+                "the errors are reported per item index.",
+)
+async def add_genres(
+    transaction: TransactionDep,
+    genres_data: Annotated[
+        list[AddGenreSchema],
+        Body(min_length=1, max_length=settings.batch.MAX_SIZE),
+    ],
+) -> BatchIdsSchema:
+    """
+    Adding genres in batch.
+    :param transaction: Database transaction.
+    :param genres_data: List of Pydantic models representing genre data.
+    :return: Pydantic model representing the created genres IDs.
+    """
+    return await GenresService.add_genres(
+        transaction,
+        genres_data,
+    )
+
+
 @router.put(
     "/{genre_id}",
     status_code=status.HTTP_200_OK,
@@ -0,0 +1,126 @@
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Query,
+    status,
+)
+
+from src.schemas.metrics import (
+    CacheMetricsSchema,
+    LockMetricsSchema,
+    PoolStatsSchema,
+    SingleFlightStatsSchema,
+)
+from src.services.internal import InternalService
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+)
+
+
+@router.get(
+    "/booking-locks",
+    status_code=status.HTTP_200_OK,
+    summary="Get booking lock metrics",
+    description="Get the booking lock wait metrics of the worker process "
+                "with the most contended books.",
+)
+async def get_booking_locks(
+    top: Annotated[int, Query(ge=1, le=100)] = 10,
+) -> LockMetricsSchema:
+    """
+    Getting the booking lock metrics.
+    :param top: Number of the most contended books.
+    :return: Pydantic model representing the lock metrics.
+    """
+    return InternalService.get_booking_locks(top)
+
+
+@router.delete(
+    "/booking-locks",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset booking lock metrics",
+    description="Reset the booking lock metrics of the worker process.",
+)
+async def reset_booking_locks() -> None:
+    """
+    Resetting the booking lock metrics.
+    :return: None.
+    """
+    InternalService.reset_booking_locks()
+
+
+@router.get(
+    "/pool",
+    status_code=status.HTTP_200_OK,
+    summary="Get connection pools statistics",
+    description="Get the database connection pools statistics "
+                "of the primary and the replicas in the worker process.",
+)
+async def get_pools() -> list[PoolStatsSchema]:
+    """
+    Getting the connection pools statistics.
+    :return: List of Pydantic models representing the pools statistics.
+    """
+    return InternalService.get_pools()
+
+
+@router.get(
+    "/cache",
+    status_code=status.HTTP_200_OK,
+    summary="Get cache metrics",
+    description="Get the hit and miss counters of the books, genres "
+                "and users caches and the in-process cache size "
+                "of the worker process.",
+)
+async def get_caches() -> CacheMetricsSchema:
+    """
+    Getting the cache metrics.
+    :return: Pydantic model representing the cache metrics.
+    """
+    return InternalService.get_caches()
+
+
+@router.delete(
+    "/cache",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset cache counters",
+    description="Reset the cache counters of the worker process.",
+)
+async def reset_caches() -> None:
+    """
+    Resetting the cache counters.
+    :return: None.
+    """
+    InternalService.reset_caches()
+
+
+@router.get(
+    "/single-flight",
+    status_code=status.HTTP_200_OK,
+    summary="Get read coalescing counters",
+    description="Get the numbers of the identical concurrent reads "
+                "run and merged by the worker process.",
+)
+async def get_single_flights() -> list[SingleFlightStatsSchema]:
+    """
+    Getting the read coalescing counters.
+    :return: List of Pydantic models representing the counters.
+    """
+    return InternalService.get_single_flights()
+
+
+@router.delete(
+    "/single-flight",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset read coalescing counters",
+    description="Reset the read coalescing counters of the worker process.",
+)
+async def reset_single_flights() -> None:
+    """
+    Resetting the read coalescing counters.
+    :return: None.
+    """
+    InternalService.reset_single_flights()
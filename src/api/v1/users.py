@@ -2,17 +2,22 @@ from typing import Annotated
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
     Path,
     status,
     UploadFile,
 )
 
-from src.api.dependencies import TransactionDep
-from src.api.pagination import (
+from src.api.dependencies import (
+    ReadTransactionDep,
+    TransactionDep,
+)
+from src.config.config import settings
+from src.schemas.batch import BatchIdsSchema
+from src.schemas.pagination import (
     BasePaginationResponse,
     PaginationParams,
-    Paginator,
 )
 from src.schemas.users import (
     UserIdSchema,
@@ -34,7 +39,7 @@ router = APIRouter(
     description="Get all users with pagination.",
 )
 async def get_all_users(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     pagination: PaginationParams = Depends(),
 ) -> BasePaginationResponse[UserSchema]:
     """
@@ -43,14 +48,10 @@ async def get_all_users(
     :param pagination: Pagination params.
     :return: List of Pydantic models representing the user.
     """
-    list_users = await UsersService.get_all_users(
+    return await UsersService.get_all_users(
         transaction,
+        pagination,
     )
-    paginator = Paginator(
-        pages=list_users,
-        params=pagination,
-    )
-    return paginator.get_response()
 
 
 @router.get(
@@ -60,7 +61,7 @@ async def get_all_users(
     description="Get user by ID.",
 )
 async def get_user(
-    transaction: TransactionDep,
+    transaction: ReadTransactionDep,
     user_id: Annotated[int, Path(ge=1)],
 ) -> UserSchema:
     """
@@ -97,6 +98,33 @@ async def add_user(
     )
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Add users in batch",
+    description="Add many users in a single transaction. "
+                "Nothing is written if any of the users is invalid, "
+                "the errors are reported per item index.",
+)
+async def add_users(
+    transaction: TransactionDep,
+    users_data: Annotated[
+        list[UserInitialsSchema],
+        Body(min_length=1, max_length=settings.batch.MAX_SIZE),
+    ],
+) -> BatchIdsSchema:
+    """
+    Adding users in batch.
+    :param transaction: Database transaction.
+    :param users_data: List of Pydantic models representing user data.
+    :return: Pydantic model representing the created users IDs.
+    """
+    return await UsersService.add_users(
+        transaction,
+        users_data,
+    )
+
+
 @router.patch(
     "/{user_id}",
     status_code=status.HTTP_200_OK,
@@ -15,6 +15,31 @@ class DatabaseSettings(BaseModel):
     HOST: str = os.getenv("DB_HOST")
     PORT: int = os.getenv("DB_PORT")
     URL: str = f"postgresql+asyncpg://{USER}:{PASS}@{HOST}:{PORT}/{NAME}"
+    REPLICA_HOSTS: list[str] = [
+        host for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host
+    ]
+    READ_YOUR_WRITES_SECONDS: int = int(
+        os.getenv("DB_READ_YOUR_WRITES_SECONDS", 0)
+    )
+    POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", -1))
+    POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false") == "true"
+    STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    PREPARED_STATEMENT_CACHE_SIZE: int = int(
+        os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)
+    )
+    JIT: str = os.getenv("DB_JIT", "")
+    STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "book-catalog")
+
+    @property
+    def REPLICA_URLS(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.USER}:{self.PASS}@{host}/{self.NAME}"
+            for host in self.REPLICA_HOSTS
+        ]
 
 
 class RedisSettings(BaseModel):
@@ -22,6 +47,55 @@ class RedisSettings(BaseModel):
     PORT: int = os.getenv("REDIS_PORT")
 
 
+class CacheSettings(BaseModel):
+    TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", 300))
+    INVALIDATION_SECONDS: int = int(os.getenv("CACHE_INVALIDATION_SECONDS", 5))
+    LOCAL_MAX_BYTES: int = int(os.getenv("CACHE_LOCAL_MAX_BYTES", 16 * 2 ** 20))
+    LOCAL_TTL_SECONDS: float = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", 30))
+    FILTERS_TTL_SECONDS: int = int(os.getenv("CACHE_FILTERS_TTL_SECONDS", 60))
+    VERSIONS_TTL_SECONDS: int = int(
+        os.getenv("CACHE_VERSIONS_TTL_SECONDS", 300)
+    )
+
+
+class SingleFlightSettings(BaseModel):
+    TIMEOUT_SECONDS: float = float(os.getenv("SINGLEFLIGHT_TIMEOUT_SECONDS", 2))
+
+
+class PaginationSettings(BaseModel):
+    COUNT_STRATEGY: str = os.getenv("PAGINATION_COUNT_STRATEGY", "exact")
+    COUNT_CAP: int = int(os.getenv("PAGINATION_COUNT_CAP", 10000))
+
+
+class ExportSettings(BaseModel):
+    CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+
+class BatchSettings(BaseModel):
+    MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", 5000))
+
+
+class ImportSettings(BaseModel):
+    CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", 10000))
+
+
+class BookingsSettings(BaseModel):
+    AVAILABILITY_MAX_BOOKS: int = int(os.getenv("BOOKINGS_AVAILABILITY_MAX_BOOKS", 300))
+    LOCK_MODE: str = os.getenv("BOOKINGS_LOCK_MODE", "none")
+    LOCK_TIMEOUT_MS: int = int(os.getenv("BOOKINGS_LOCK_TIMEOUT_MS", 2000))
+    LOCK_METRICS_MAX_KEYS: int = int(
+        os.getenv("BOOKINGS_LOCK_METRICS_MAX_KEYS", 1000)
+    )
+    HOLD_TTL_SECONDS: int = int(os.getenv("BOOKINGS_HOLD_TTL_SECONDS", 90))
+    EXPIRY_BATCH_SIZE: int = int(os.getenv("BOOKINGS_EXPIRY_BATCH_SIZE", 5000))
+    EXPIRY_POLL_SECONDS: float = float(os.getenv("BOOKINGS_EXPIRY_POLL_SECONDS", 5))
+    EXPIRY_RECONCILE_HOURS: int = int(os.getenv("BOOKINGS_EXPIRY_RECONCILE_HOURS", 2))
+    PARTITIONS_AHEAD: int = int(os.getenv("BOOKINGS_PARTITIONS_AHEAD", 12))
+    PARTITIONS_ARCHIVE: bool = (
+        os.getenv("BOOKINGS_PARTITIONS_ARCHIVE", "false") == "true"
+    )
+
+
 class UsersSettings(BaseModel):
     AVATAR_PATH: str = "src/static/users_avatars/"
 
@@ -30,6 +104,13 @@ class Settings(BaseSettings):
     api: ApiSettings = ApiSettings()
     db: DatabaseSettings = DatabaseSettings()
     redis: RedisSettings = RedisSettings()
+    cache: CacheSettings = CacheSettings()
+    singleflight: SingleFlightSettings = SingleFlightSettings()
+    pagination: PaginationSettings = PaginationSettings()
+    export: ExportSettings = ExportSettings()
+    batch: BatchSettings = BatchSettings()
+    importer: ImportSettings = ImportSettings()
+    bookings: BookingsSettings = BookingsSettings()
     user: UsersSettings = UsersSettings()
 
 
@@ -1,5 +1,6 @@
 __all__ = (
     "Base",
+    "BookingPeriods",
     "Bookings",
     "Books",
     "Genres",
@@ -8,6 +9,7 @@ __all__ = (
 )
 
 from src.db.database import Base
+from src.models.booking_periods import BookingPeriods
 from src.models.bookings import Bookings
 from src.models.books import Books
 from src.models.books_genres import BooksGenres
@@ -1,6 +1,8 @@
+import itertools
 import re
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
@@ -12,11 +14,69 @@ from sqlalchemy.orm import (
 from src.config.config import settings
 
 
-engine = create_async_engine(settings.db.URL)
+def get_server_settings() -> dict[str, str]:
+    """
+    Getting the PostgreSQL settings of every connection.
+    Unset values keep the server defaults.
+    :return: Server settings.
+    """
+    server_settings = {"application_name": settings.db.APPLICATION_NAME}
+    if settings.db.JIT:
+        server_settings["jit"] = settings.db.JIT
+    if settings.db.STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(
+            settings.db.STATEMENT_TIMEOUT_MS,
+        )
+    return server_settings
+
+
+def create_engine(url: str = settings.db.URL) -> AsyncEngine:
+    """
+    Creating a database engine with the configured connection pool.
+    Behind PgBouncer in transaction mode both statement caches
+    must be disabled with zero sizes.
+    :param url: Database URL.
+    :return: Database engine.
+    """
+    return create_async_engine(
+        url,
+        pool_size=settings.db.POOL_SIZE,
+        max_overflow=settings.db.MAX_OVERFLOW,
+        pool_timeout=settings.db.POOL_TIMEOUT,
+        pool_recycle=settings.db.POOL_RECYCLE,
+        pool_pre_ping=settings.db.POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.db.STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": (
+                settings.db.PREPARED_STATEMENT_CACHE_SIZE
+            ),
+            "server_settings": get_server_settings(),
+        },
+    )
+
+
+engine = create_engine()
 async_session_maker = async_sessionmaker(
     engine,
     expire_on_commit=False,
 )
+replica_engines = [create_engine(url) for url in settings.db.REPLICA_URLS]
+replica_session_makers = itertools.cycle(
+    [
+        async_sessionmaker(replica_engine, expire_on_commit=False)
+        for replica_engine in replica_engines
+    ]
+    or [async_session_maker]
+)
+
+
+def get_read_session_maker() -> async_sessionmaker:
+    """
+    Getting the session factory of the next replica (round-robin),
+    or of the primary if no replicas are configured.
+    :return: Session factory.
+    """
+    return next(replica_session_makers)
 
 
 class Base(DeclarativeBase):
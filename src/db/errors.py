@@ -0,0 +1,15 @@
+from sqlalchemy.exc import DBAPIError
+
+CHECK_VIOLATION = "23514"
+EXCLUSION_VIOLATION = "23P01"
+FOREIGN_KEY_VIOLATION = "23503"
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def get_sqlstate(error: DBAPIError) -> str | None:
+    """
+    Getting the PostgreSQL error code of a database error.
+    :param error: SQLAlchemy database error.
+    :return: SQLSTATE code or None if it is unknown.
+    """
+    return getattr(error.orig, "sqlstate", None)
@@ -0,0 +1,159 @@
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+PARTITIONED_TABLE = "bookings"
+PERIODS_TABLE = "booking_periods"
+PARTITION_NAME = re.compile(rf"^{PARTITIONED_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Shifting the first day of a month by a number of months.
+    :param month: First day of the month.
+    :param months: Number of months, negative to shift back.
+    :return: First day of the shifted month.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    """
+    Getting the name of the bookings partition of a month.
+    :param month: First day of the month.
+    :return: Partition name.
+    """
+    return f"{PARTITIONED_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def get_create_partition_sql(month: date) -> str:
+    """
+    Building the DDL of the bookings partition of a month.
+    :param month: First day of the month.
+    :return: CREATE TABLE statement.
+    """
+    name = get_partition_name(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {name} "
+        f"PARTITION OF {PARTITIONED_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def get_months(current_date: date, ahead: int) -> list[date]:
+    """
+    Getting the months of the partitions that must exist:
+    the current month and the months ahead of it.
+    :param current_date: Current date.
+    :param ahead: Number of months ahead.
+    :return: First days of the months.
+    """
+    month = current_date.replace(day=1)
+    return [add_months(month, shift) for shift in range(ahead + 1)]
+
+
+def get_partitioned_range(
+    current_date: date,
+    ahead: int,
+) -> tuple[date, date]:
+    """
+    Getting the range of the end dates covered by the partitions
+    of the current month and the months ahead of it.
+    :param current_date: Current date.
+    :param ahead: Number of months ahead.
+    :return: First covered date and first date after the range.
+    """
+    month = current_date.replace(day=1)
+    return month, add_months(month, ahead + 1)
+
+
+async def get_partitions(connection: AsyncConnection) -> dict[str, date]:
+    """
+    Getting the monthly partitions of the bookings table.
+    :param connection: Database connection.
+    :return: Partitions months by partition names.
+    """
+    result = await connection.execute(
+        text(
+            "SELECT child.relname "
+            "FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARTITIONED_TABLE},
+    )
+    partitions = {}
+    for name in result.scalars():
+        match = PARTITION_NAME.match(name)
+        if match:
+            year, month = match.groups()
+            partitions[name] = date(int(year), int(month), 1)
+    return partitions
+
+
+async def create_partitions(
+    connection: AsyncConnection,
+    current_date: date,
+    ahead: int,
+) -> list[str]:
+    """
+    Creating the missing bookings partitions
+    of the current month and the months ahead of it.
+    :param connection: Database connection.
+    :param current_date: Current date.
+    :param ahead: Number of months ahead.
+    :return: Names of the created partitions.
+    """
+    existing = await get_partitions(connection)
+    created = []
+    for month in get_months(current_date, ahead):
+        name = get_partition_name(month)
+        if name not in existing:
+            await connection.execute(text(get_create_partition_sql(month)))
+            created.append(name)
+    return created
+
+
+async def drop_expired_partitions(
+    connection: AsyncConnection,
+    current_date: date,
+    archive: bool,
+) -> list[str]:
+    """
+    Detaching the bookings partitions whose months have ended
+    and dropping them unless they are archived.
+    The periods of their bookings are deleted first,
+    they reference the partitions.
+    The connection must be in autocommit mode:
+    partitions are detached concurrently, without blocking
+    the queries to the bookings table.
+    :param connection: Database connection.
+    :param current_date: Current date.
+    :param archive: Whether to keep the detached partitions as tables.
+    :return: Names of the expired partitions.
+    """
+    partitions = await get_partitions(connection)
+    expired = sorted(
+        name
+        for name, month in partitions.items()
+        if add_months(month, 1) <= current_date
+    )
+    if expired:
+        await connection.execute(
+            text(f"DELETE FROM {PERIODS_TABLE} WHERE date_to < :month"),
+            {"month": current_date.replace(day=1)},
+        )
+    for name in expired:
+        await connection.execute(
+            text(
+                f"ALTER TABLE {PARTITIONED_TABLE} "
+                f"DETACH PARTITION {name} CONCURRENTLY"
+            )
+        )
+        if not archive:
+            await connection.execute(text(f"DROP TABLE {name}"))
+    return expired
@@ -0,0 +1,18 @@
+from redis.asyncio import Redis
+
+from src.config.config import settings
+
+
+def get_redis_client() -> Redis:
+    """
+    Creating a Redis client.
+    :return: Redis client.
+    """
+    return Redis(
+        host=settings.redis.HOST,
+        port=settings.redis.PORT,
+        decode_responses=True,
+    )
+
+
+redis_client = get_redis_client()
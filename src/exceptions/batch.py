@@ -0,0 +1,13 @@
+from fastapi import status
+
+from src.exceptions.base import CatalogException
+from src.schemas.batch import BatchItemErrorSchema
+
+
+class BatchValidationException(CatalogException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Invalid batch items"
+
+    def __init__(self, errors: list[BatchItemErrorSchema]):
+        self.detail = [error.model_dump() for error in errors]
+        super().__init__()
@@ -1,3 +1,8 @@
+from datetime import (
+    date,
+    timedelta,
+)
+
 from fastapi import status
 
 from src.exceptions.base import CatalogException
@@ -8,11 +13,33 @@ class BookingWasNotFoundException(CatalogException):
     detail = "The booking was not found"
 
 
+class BookingDatesOutOfRangeException(CatalogException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Bookings must end between {first} and {last}"
+
+    def __init__(self, start: date, end: date):
+        self.detail = self.detail.format(
+            first=start.isoformat(),
+            last=(end - timedelta(days=1)).isoformat(),
+        )
+        super().__init__()
+
+
 class BookIsBookedException(CatalogException):
     status_code = status.HTTP_409_CONFLICT
     detail = "The book has already been booked for the selected dates"
 
 
+class BookIsHeldException(CatalogException):
+    status_code = status.HTTP_409_CONFLICT
+    detail = "The book is held by another user for the selected dates"
+
+
+class HoldsAreUnavailableException(CatalogException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Books cannot be held now, try again later"
+
+
 class DateFromCannotBeAfterDateToException(CatalogException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "The start date cannot be later than the end date"
@@ -21,3 +48,8 @@ class DateFromCannotBeAfterDateToException(CatalogException):
 class InvalidUserOrBookDataException(CatalogException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Invalid user or book data"
+
+
+class BookIsLockedException(CatalogException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "The book is being booked by other users, try again later"
@@ -1,11 +1,40 @@
+import asyncio
+from contextlib import (
+    asynccontextmanager,
+    suppress,
+)
+
 from fastapi import FastAPI
 
 from src.api.v1 import router_v1
+from src.db.redis import redis_client
+from src.utils.cache import (
+    listen_invalidations,
+    local_cache,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Running the cache invalidation listener of the worker
+    while the application is serving.
+    :param app: FastAPI application.
+    """
+    listener = asyncio.create_task(
+        listen_invalidations(redis_client, local_cache),
+    )
+    yield
+    listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await listener
+
 
 app = FastAPI(
     title="Book catalog API",
     version="0.1.0",
     root_path="/api",
+    lifespan=lifespan,
 )
 
 app.include_router(router_v1)
@@ -1,13 +1,24 @@
+from datetime import date
 from logging.config import fileConfig
 
 from alembic import context
+from alembic.script import ScriptDirectory
 from sqlalchemy import (
+    Connection,
     engine_from_config,
+    inspect,
     pool,
+    text,
 )
 
 from src.config.config import settings
 from src.db.database import Base
+from src.db.partitions import (
+    PARTITION_NAME,
+    PARTITIONED_TABLE,
+    get_create_partition_sql,
+    get_months,
+)
 
 
 config = context.config
@@ -22,6 +33,60 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def create_extensions() -> None:
+    """Create the extensions the models depend on.
+
+    btree_gist lets the booking periods exclusion constraint
+    combine `book_id WITH =` and `period WITH &&`.
+
+    """
+    context.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+
+def create_partitions() -> None:
+    """Create the bookings partitions of the current month
+    and the months ahead of it.
+
+    Later months are created by the Celery beat task.
+
+    """
+    months = get_months(date.today(), settings.bookings.PARTITIONS_AHEAD)
+    for month in months:
+        context.execute(get_create_partition_sql(month))
+
+
+def include_object(object_, name, type_, reflected, compare_to) -> bool:
+    """Leave the bookings partitions out of the autogenerated revisions.
+
+    Partitions are created by the migrations and the Celery beat task,
+    they and the foreign keys referencing them have no models.
+
+    """
+    if type_ == "table" and reflected and PARTITION_NAME.match(name):
+        return False
+    if type_ == "foreign_key_constraint":
+        return not PARTITION_NAME.match(object_.referred_table.name)
+    return True
+
+
+def forget_generated_revisions(connection: Connection) -> None:
+    """Forget the database revision if it is not in the versions.
+
+    Revisions generated on start are not kept by the deployments,
+    the database is then upgraded from the revisions of the repository
+    and the difference to the models is generated again.
+
+    """
+    if not inspect(connection).has_table("alembic_version"):
+        return
+    script = ScriptDirectory.from_config(config)
+    known = [revision.revision for revision in script.walk_revisions()]
+    connection.execute(
+        text("DELETE FROM alembic_version WHERE version_num <> ALL(:known)"),
+        {"known": known},
+    )
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -40,10 +105,13 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
+        create_extensions()
         context.run_migrations()
+        create_partitions()
 
 
 def run_migrations_online() -> None:
@@ -63,10 +131,15 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
+            create_extensions()
+            forget_generated_revisions(connection)
             context.run_migrations()
+            if inspect(connection).has_table(PARTITIONED_TABLE):
+                create_partitions()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,186 @@
+"""partition bookings
+
+Revision ID: 6f1c2a9d4b7e
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.config.config import settings
+from src.db.partitions import (
+    PARTITIONED_TABLE,
+    PERIODS_TABLE,
+    get_create_partition_sql,
+    get_months,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1c2a9d4b7e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEGACY_TABLE = f"{PARTITIONED_TABLE}_old"
+
+
+def partition_bookings(connection: sa.Connection) -> None:
+    """
+    Moving the bookings of an unpartitioned table
+    into monthly partitions by the end date.
+    The columns and the ID sequence of the table are kept,
+    its constraints and indexes are rebuilt for the partitions.
+    :param connection: Database connection.
+    """
+    op.rename_table(PARTITIONED_TABLE, LEGACY_TABLE)
+    constraints = connection.execute(
+        sa.text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) "
+            "AND contype IN ('p', 'u', 'x')"
+        ),
+        {"table": LEGACY_TABLE},
+    )
+    for name in constraints.scalars().all():
+        op.drop_constraint(name, LEGACY_TABLE)
+    indexes = connection.execute(
+        sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+        {"table": LEGACY_TABLE},
+    )
+    for name in indexes.scalars().all():
+        op.drop_index(name, table_name=LEGACY_TABLE)
+
+    op.execute(
+        f"CREATE TABLE {PARTITIONED_TABLE} "
+        f"(LIKE {LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING GENERATED) "
+        f"PARTITION BY RANGE (date_to)"
+    )
+    months = connection.execute(
+        sa.text(
+            f"SELECT DISTINCT date_trunc('month', date_to)::date "
+            f"FROM {LEGACY_TABLE}"
+        )
+    )
+    current = get_months(date.today(), settings.bookings.PARTITIONS_AHEAD)
+    for month in sorted(set(months.scalars()) | set(current)):
+        op.execute(get_create_partition_sql(month))
+
+    columns = connection.execute(
+        sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = :table AND is_generated = 'NEVER' "
+            "ORDER BY ordinal_position"
+        ),
+        {"table": LEGACY_TABLE},
+    )
+    names = ", ".join(columns.scalars())
+    op.execute(
+        f"INSERT INTO {PARTITIONED_TABLE} ({names}) "
+        f"SELECT {names} FROM {LEGACY_TABLE}"
+    )
+
+    op.create_primary_key(
+        f"{PARTITIONED_TABLE}_pkey",
+        PARTITIONED_TABLE,
+        ["id", "date_to"],
+    )
+    op.create_foreign_key(
+        f"{PARTITIONED_TABLE}_book_id_fkey",
+        PARTITIONED_TABLE,
+        "books",
+        ["book_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        f"{PARTITIONED_TABLE}_user_id_fkey",
+        PARTITIONED_TABLE,
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        "idx_bookings_book_period",
+        PARTITIONED_TABLE,
+        ["book_id", "period"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        op.f("ix_bookings_date_to"),
+        PARTITIONED_TABLE,
+        ["date_to"],
+        unique=False,
+    )
+    op.execute(
+        f"ALTER SEQUENCE {PARTITIONED_TABLE}_id_seq "
+        f"OWNED BY {PARTITIONED_TABLE}.id"
+    )
+    op.drop_table(LEGACY_TABLE)
+
+
+def create_booking_periods() -> None:
+    """
+    Creating the booking periods table
+    and filling it with the periods of the existing bookings.
+    """
+    op.create_table(
+        PERIODS_TABLE,
+        sa.Column("booking_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("date_to", sa.DateTime(), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("period", postgresql.DATERANGE(), nullable=False),
+        postgresql.ExcludeConstraint(
+            (sa.column("book_id"), "="),
+            (sa.column("period"), "&&"),
+            using="gist",
+            name="excl_booking_periods_book_period",
+        ),
+        sa.ForeignKeyConstraint(
+            ["booking_id", "date_to"],
+            ["bookings.id", "bookings.date_to"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("booking_id"),
+    )
+    op.create_index(
+        op.f("ix_booking_periods_date_to"),
+        PERIODS_TABLE,
+        ["date_to"],
+        unique=False,
+    )
+    op.execute(
+        f"INSERT INTO {PERIODS_TABLE} (booking_id, date_to, book_id, period) "
+        f"SELECT id, date_to, book_id, period FROM {PARTITIONED_TABLE}"
+    )
+
+
+def upgrade() -> None:
+    # The tables of a new database are created by the autogenerated
+    # revisions, a deployed one is moved to the partitioned bookings.
+    connection = op.get_bind()
+    relkind = connection.execute(
+        sa.text(
+            "SELECT relkind::text FROM pg_class "
+            "WHERE oid = to_regclass(:table)"
+        ),
+        {"table": PARTITIONED_TABLE},
+    ).scalar()
+    if relkind is None:
+        return
+    if relkind == "r":
+        partition_bookings(connection)
+    if not sa.inspect(connection).has_table(PERIODS_TABLE):
+        create_booking_periods()
+
+
+def downgrade() -> None:
+    op.execute(f"DROP TABLE IF EXISTS {PERIODS_TABLE}")
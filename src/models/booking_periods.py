@@ -0,0 +1,46 @@
+from datetime import (
+    date,
+    datetime,
+)
+
+from sqlalchemy import ForeignKeyConstraint
+from sqlalchemy.dialects.postgresql import (
+    DATERANGE,
+    ExcludeConstraint,
+    Range,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from src.db.database import Base
+
+
+class BookingPeriods(Base):
+    # Exclusion constraints of a partitioned table only cover each partition,
+    # so the periods of all bookings are written to this unpartitioned table
+    # by the same statements as the bookings and overlaps are excluded here.
+    # The end date follows its booking through the foreign key.
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["booking_id", "date_to"],
+            ["bookings.id", "bookings.date_to"],
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+        ),
+        ExcludeConstraint(
+            ("book_id", "="),
+            ("period", "&&"),
+            name="excl_booking_periods_book_period",
+            using="gist",
+        ),
+    )
+
+    booking_id: Mapped[int] = mapped_column(
+        primary_key=True,
+        autoincrement=False,
+    )
+    date_to: Mapped[datetime] = mapped_column(index=True)
+    book_id: Mapped[int]
+    period: Mapped[Range[date]] = mapped_column(DATERANGE)
@@ -1,25 +1,54 @@
-from datetime import datetime
+from datetime import (
+    date,
+    datetime,
+)
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import (
+    Computed,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import (
+    DATERANGE,
+    Range,
+)
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
 )
 
 from src.db.database import Base
+from src.models.mixins import VersionMixin
 from src.schemas.bookings import BookingSchema
 
 
-class Bookings(Base):
-    id: Mapped[int] = mapped_column(primary_key=True)
+class Bookings(VersionMixin, Base):
+    # Monthly partitions by the end date are created by src.db.partitions,
+    # overlapping bookings are excluded by the booking periods table.
+    # The overlap searches use the GiST index of every partition.
+    __table_args__ = (
+        Index(
+            "idx_bookings_book_period",
+            "book_id",
+            "period",
+            postgresql_using="gist",
+        ),
+        {"postgresql_partition_by": "RANGE (date_to)"},
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     book_id: Mapped[int] = mapped_column(
         ForeignKey("books.id", ondelete="CASCADE"),
     )
     date_from: Mapped[datetime]
-    date_to: Mapped[datetime]
+    date_to: Mapped[datetime] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
     )
+    period: Mapped[Range[date]] = mapped_column(
+        DATERANGE,
+        Computed("daterange(date_from::date, date_to::date, '[]')"),
+    )
 
     def to_read_model(self) -> BookingSchema:
         return BookingSchema(
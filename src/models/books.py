@@ -1,4 +1,7 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
@@ -6,10 +9,19 @@ from sqlalchemy.orm import (
 )
 
 from src.db.database import Base
+from src.models.mixins import VersionMixin
 from src.schemas.books import BookSchema
 
 
-class Books(Base):
+class Books(VersionMixin, Base):
+    __table_args__ = (
+        Index(
+            "idx_books_author_name",
+            "author_id",
+            "name",
+        ),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
     price: Mapped[float]
@@ -34,4 +46,5 @@ class Books(Base):
             price=self.price,
             author_id=self.author_id,
             genres=[genre.name for genre in self.genres],
+            version=self.version,
         )
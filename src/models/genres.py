@@ -5,17 +5,18 @@ from sqlalchemy.orm import (
 )
 
 from src.db.database import Base
+from src.models.mixins import VersionMixin
 from src.schemas.genres import GenreSchema
 
 
-class Genres(Base):
+class Genres(VersionMixin, Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(unique=True)
 
     books: Mapped[list["Books"]] = relationship(
         secondary="books_genres",
         back_populates="genres",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def to_read_model(self) -> GenreSchema:
@@ -0,0 +1,20 @@
+from sqlalchemy import text
+from sqlalchemy.orm import (
+    Mapped,
+    declared_attr,
+    mapped_column,
+)
+
+
+class VersionMixin:
+    @declared_attr
+    def version(cls) -> Mapped[int]:
+        """
+        Row version: 1 on insert, incremented by every UPDATE,
+        including the bulk and Core ones.
+        :return: Version column.
+        """
+        return mapped_column(
+            server_default=text("1"),
+            onupdate=text(f"{cls.__tablename__}.version + 1"),
+        )
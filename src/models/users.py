@@ -7,10 +7,11 @@ from sqlalchemy.orm import (
 )
 
 from src.db.database import Base
+from src.models.mixins import VersionMixin
 from src.schemas.users import UserSchema
 
 
-class Users(Base):
+class Users(VersionMixin, Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str]
     last_name: Mapped[str]
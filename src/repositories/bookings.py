@@ -1,15 +1,67 @@
-from datetime import date
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+)
+from typing import (
+    AsyncIterator,
+    Sequence,
+)
 
 from sqlalchemy import (
+    CTE,
+    Date,
+    Integer,
     and_,
+    column,
     delete,
-    or_,
+    func,
+    insert,
+    literal,
+    literal_column,
     select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    DATEMULTIRANGE,
+    DATERANGE,
+    Range,
+    aggregate_order_by,
 )
 
+from src.models.booking_periods import BookingPeriods
 from src.models.bookings import Bookings
+from src.models.books import Books
+from src.models.users import Users
+from src.schemas.bookings import (
+    AddBookingSchema,
+    BookAvailabilitySchema,
+    BookingConflictSchema,
+    BookingLockMode,
+    BookingSchema,
+    BookingWriteSchema,
+    CheckBookingSchema,
+    PeriodSchema,
+)
+from src.utils.expiry import get_expired_until
 from src.utils.repository import BaseRepository
 
+BOOK_LOCK_NAMESPACE = 1
+
+
+def to_period(period: Range[date]) -> PeriodSchema:
+    """
+    Converting a canonical `[)` date range
+    to a period with an inclusive end date.
+    :param period: Date range.
+    :return: Pydantic model representing the period.
+    """
+    return PeriodSchema(
+        date_from=period.lower,
+        date_to=period.upper - timedelta(days=1),
+    )
+
 
 class BookingsRepository(BaseRepository):
     model = Bookings
@@ -22,7 +74,9 @@ class BookingsRepository(BaseRepository):
     ) -> bool | int:
         """
         Checking the availability
-        of the book on the requested dates
+        of the book on the requested dates.
+        Partitions of the bookings ended
+        before the start date are pruned.
         :param book_id: Book ID.
         :param date_from: Booking start date.
         :param date_to: Booking end date.
@@ -32,41 +86,482 @@ class BookingsRepository(BaseRepository):
         statement = (
             select(self.model.user_id)
             .filter(
-                and_(
-                    self.model.book_id == book_id,
-                    or_(
-                        and_(
-                            self.model.date_from <= date_from,
-                            self.model.date_to >= date_from
-                        ),
-                        and_(
-                            self.model.date_from <= date_to,
-                            self.model.date_to >= date_to
-                        ),
-                        and_(
-                            self.model.date_from >= date_from,
-                            self.model.date_to <= date_to
-                        )
-                    )
-                )
+                self.model.book_id == book_id,
+                self.model.date_to >= date_from,
+                self.model.period.overlaps(
+                    Range(date_from, date_to, bounds="[]"),
+                ),
             )
+            .limit(1)
         )
         is_booked = await self.session.execute(statement)
         bookings = is_booked.scalar_one_or_none()
         return bookings
 
-    async def remove_old_bookings(
+    async def lock_books(
             self,
-            current_date: date
+            book_ids: list[int],
+            mode: BookingLockMode,
+            timeout_ms: int,
     ) -> None:
         """
-        Deleting bookings
-        with an expired end date
-        :param current_date: Current date
+        Locking the books until the end of the transaction
+        to serialize their booking writes.
+        The books are locked in ID order to avoid deadlocks.
+        The lock timeout is set by the same statement
+        and stays for the rest of the transaction.
+        :param book_ids: Books IDs.
+        :param mode: Lock mode: advisory locks on the books IDs
+                     or row locks on the books.
+        :param timeout_ms: Lock wait timeout in milliseconds.
         :return: None.
         """
+        book_ids = sorted(set(book_ids))
+        lock_timeout = func.set_config(
+            "lock_timeout",
+            f"{timeout_ms}ms",
+            True,
+        )
+        if mode is BookingLockMode.ADVISORY:
+            locked = (
+                func.unnest(literal(book_ids, ARRAY(Integer)))
+                .table_valued(column("book_id", Integer))
+                .render_derived(name="locked")
+            )
+            statement = select(
+                lock_timeout,
+                func.pg_advisory_xact_lock(
+                    BOOK_LOCK_NAMESPACE,
+                    locked.c.book_id,
+                ),
+            )
+        else:
+            statement = (
+                select(lock_timeout)
+                .select_from(Books)
+                .filter(Books.id.in_(book_ids))
+                .order_by(Books.id)
+                .with_for_update()
+            )
+        await self.session.execute(statement)
+
+    def get_write_checks(
+            self,
+            data: dict,
+            booking_id: int | None = None,
+    ) -> tuple[CTE, CTE, CTE]:
+        """
+        Building the checks of a booking write:
+        the user, the book and a conflicting booking.
+        :param data: Booking data.
+        :param booking_id: ID of the updated booking
+                           excluded from the conflicts.
+        :return: CTEs of the user, the book and the conflict.
+        """
+        user = (
+            select(Users.id)
+            .filter(Users.id == data["user_id"])
+            .cte("booking_user")
+        )
+        book = (
+            select(Books.id)
+            .filter(Books.id == data["book_id"])
+            .cte("booking_book")
+        )
+        conflict = (
+            select(self.model.id)
+            .filter(
+                self.model.book_id == data["book_id"],
+                self.model.date_to >= data["date_from"],
+                self.model.period.overlaps(
+                    Range(data["date_from"], data["date_to"], bounds="[]"),
+                ),
+            )
+            .limit(1)
+        )
+        if booking_id is not None:
+            conflict = conflict.filter(self.model.id != booking_id)
+        return user, book, conflict.cte("booking_conflict")
+
+    async def execute_write(
+            self,
+            written: CTE,
+            checks: tuple[CTE, ...],
+    ) -> BookingWriteSchema:
+        """
+        Executing a booking write together with its checks.
+        :param written: CTE of the write of the booking period
+                        returning the booking ID.
+        :param checks: CTEs of the user, the book, the conflict
+                       and optionally the updated booking.
+        :return: Pydantic model representing the write result.
+        """
+        user, book, conflict, *target = checks
+        statement = select(
+            select(written.c.id).scalar_subquery(),
+            select(user).exists(),
+            select(book).exists(),
+            select(conflict).exists(),
+            *(select(cte).exists() for cte in target),
+        )
+        result = await self.session.execute(statement)
+        booking_id, user_exists, book_exists, is_booked, *found = result.one()
+        return BookingWriteSchema(
+            booking_id=booking_id,
+            user_exists=user_exists,
+            book_exists=book_exists,
+            is_booked=is_booked,
+            is_found=all(found),
+        )
+
+    async def add_checked(self, data: dict) -> BookingWriteSchema:
+        """
+        Adding a booking in one statement:
+        it is inserted only if the user and the book exist
+        and the book is free on the requested dates,
+        its period is inserted by the same statement.
+        :param data: Booking data.
+        :return: Pydantic model representing the write result.
+        """
+        user, book, conflict = self.get_write_checks(data)
+        written = (
+            insert(self.model)
+            .from_select(
+                ["user_id", "book_id", "date_from", "date_to"],
+                select(
+                    user.c.id,
+                    book.c.id,
+                    literal(data["date_from"], self.model.date_from.type),
+                    literal(data["date_to"], self.model.date_to.type),
+                )
+                .filter(~select(conflict).exists()),
+            )
+            .returning(
+                self.model.id,
+                self.model.book_id,
+                self.model.date_to,
+                self.model.period,
+            )
+            .cte("booking_written")
+        )
+        period = (
+            insert(BookingPeriods)
+            .from_select(
+                ["booking_id", "book_id", "date_to", "period"],
+                select(
+                    written.c.id,
+                    written.c.book_id,
+                    written.c.date_to,
+                    written.c.period,
+                ),
+            )
+            .returning(BookingPeriods.booking_id.label("id"))
+            .cte("booking_period")
+        )
+        return await self.execute_write(period, (user, book, conflict))
+
+    async def edit_checked(
+            self,
+            booking_id: int,
+            data: dict,
+    ) -> BookingWriteSchema:
+        """
+        Updating a booking by ID in one statement:
+        it is updated only if the booking, the user and the book exist
+        and the book is free on the requested dates,
+        its period is updated by the same statement.
+        :param booking_id: Booking ID.
+        :param data: Booking data.
+        :return: Pydantic model representing the write result.
+        """
+        user, book, conflict = self.get_write_checks(data, booking_id)
+        target = (
+            select(self.model.id)
+            .filter(self.model.id == booking_id)
+            .cte("booking_target")
+        )
+        written = (
+            update(self.model)
+            .values(**data)
+            .filter(
+                self.model.id == booking_id,
+                select(user).exists(),
+                select(book).exists(),
+                ~select(conflict).exists(),
+            )
+            .returning(
+                self.model.id,
+                self.model.book_id,
+                self.model.date_to,
+                self.model.period,
+            )
+            .cte("booking_written")
+        )
+        period = (
+            update(BookingPeriods)
+            .values(
+                book_id=written.c.book_id,
+                period=written.c.period,
+            )
+            .filter(BookingPeriods.booking_id == written.c.id)
+            .returning(BookingPeriods.booking_id.label("id"))
+            .cte("booking_period")
+        )
+        return await self.execute_write(
+            period,
+            (user, book, conflict, target),
+        )
+
+    async def add_many(self, data: list[dict]) -> list[int]:
+        """
+        Adding bookings and their periods to the database
+        with multi-row INSERT statements.
+        :param data: List of bookings data.
+        :return: IDs of the created bookings in the order of the data.
+        """
+        statement = (
+            insert(self.model)
+            .returning(
+                self.model.id,
+                self.model.book_id,
+                self.model.date_to,
+                self.model.period,
+                sort_by_parameter_order=True,
+            )
+        )
+        result = await self.session.execute(statement, data)
+        periods = [
+            {
+                "booking_id": booking_id,
+                "book_id": book_id,
+                "date_to": date_to,
+                "period": period,
+            }
+            for booking_id, book_id, date_to, period in result.tuples()
+        ]
+        await self.session.execute(insert(BookingPeriods), periods)
+        return [period["booking_id"] for period in periods]
+
+    async def find_conflicts(
+            self,
+            periods: Sequence[CheckBookingSchema | AddBookingSchema],
+    ) -> list[BookingConflictSchema]:
+        """
+        Search for the bookings that overlap the requested periods
+        in one query: the periods are passed as arrays,
+        unnested and joined against the bookings.
+        The dates of every period must be in order.
+        :param periods: Requested books and dates.
+        :return: List of Pydantic models representing
+                 the conflicting periods, sorted by the request index.
+        """
+        requested = (
+            func.unnest(
+                literal([period.book_id for period in periods], ARRAY(Integer)),
+                literal([period.date_from for period in periods], ARRAY(Date)),
+                literal([period.date_to for period in periods], ARRAY(Date)),
+            )
+            .table_valued(
+                column("book_id", Integer),
+                column("date_from", Date),
+                column("date_to", Date),
+                with_ordinality="position",
+            )
+            .render_derived(name="requested")
+        )
+        requested_period = func.daterange(
+            requested.c.date_from,
+            requested.c.date_to,
+            literal_column("'[]'"),
+            type_=DATERANGE,
+        )
+        statement = (
+            select(
+                requested.c.position,
+                requested.c.book_id,
+                requested.c.date_from,
+                requested.c.date_to,
+                func.array_agg(
+                    aggregate_order_by(self.model.id, self.model.id),
+                ),
+                func.array_agg(
+                    aggregate_order_by(self.model.user_id, self.model.id),
+                ),
+            )
+            .join(
+                self.model,
+                and_(
+                    self.model.book_id == requested.c.book_id,
+                    self.model.date_to >= requested.c.date_from,
+                    self.model.period.overlaps(requested_period),
+                ),
+            )
+            .group_by(
+                requested.c.position,
+                requested.c.book_id,
+                requested.c.date_from,
+                requested.c.date_to,
+            )
+            .order_by(requested.c.position)
+        )
+        result = await self.session.execute(statement)
+        return [
+            BookingConflictSchema(
+                index=position - 1,
+                book_id=book_id,
+                date_from=date_from,
+                date_to=date_to,
+                booking_ids=booking_ids,
+                user_ids=user_ids,
+            )
+            for (
+                position,
+                book_id,
+                date_from,
+                date_to,
+                booking_ids,
+                user_ids,
+            ) in result.tuples()
+        ]
+
+    async def find_availability(
+            self,
+            book_ids: list[int],
+            date_from: date,
+            date_to: date,
+    ) -> list[BookAvailabilitySchema]:
+        """
+        Calculating the busy and free periods of the books
+        in one query: overlapping bookings are merged
+        with `range_agg` and the free periods are
+        the rest of the requested window.
+        Unknown books are skipped.
+        :param book_ids: Books IDs.
+        :param date_from: Window start date.
+        :param date_to: Window end date.
+        :return: List of Pydantic models representing
+                 the availability of the books, sorted by book ID.
+        """
+        window = literal(
+            Range(date_from, date_to, bounds="[]"),
+            DATERANGE,
+        )
+        busy = (
+            select(
+                self.model.book_id,
+                func.range_agg(
+                    self.model.period.intersection(window),
+                    type_=DATEMULTIRANGE,
+                ).label("periods"),
+            )
+            .filter(
+                self.model.book_id.in_(book_ids),
+                self.model.date_to >= date_from,
+                self.model.period.overlaps(window),
+            )
+            .group_by(self.model.book_id)
+            .subquery()
+        )
+        busy_periods = func.coalesce(
+            busy.c.periods,
+            func.datemultirange(type_=DATEMULTIRANGE),
+            type_=DATEMULTIRANGE,
+        )
+        statement = (
+            select(
+                Books.id,
+                busy_periods,
+                func.datemultirange(window, type_=DATEMULTIRANGE)
+                .difference(busy_periods),
+            )
+            .outerjoin(busy, busy.c.book_id == Books.id)
+            .filter(Books.id.in_(book_ids))
+            .order_by(Books.id)
+        )
+        result = await self.session.execute(statement)
+        return [
+            BookAvailabilitySchema(
+                book_id=book_id,
+                busy=[to_period(period) for period in busy_ranges],
+                free=[to_period(period) for period in free_ranges],
+            )
+            for book_id, busy_ranges, free_ranges in result.tuples()
+        ]
+
+    async def remove_old_bookings(
+            self,
+            now: datetime,
+            limit: int,
+    ) -> int:
+        """
+        Deleting a batch of bookings
+        with an expired end date.
+        Rows locked by concurrent transactions are skipped,
+        so several workers can delete at once.
+        The end date is also bounded in the delete itself,
+        so only the partitions of expired months are scanned.
+        :param now: Current time.
+        :param limit: Maximum number of deleted bookings.
+        :return: Number of deleted bookings.
+        """
+        expired_until = get_expired_until(now)
+        expired = (
+            select(self.model.id)
+            .filter(self.model.date_to <= expired_until)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
         query = (
             delete(self.model)
-            .filter(self.model.date_to <= current_date)
+            .filter(
+                self.model.date_to <= expired_until,
+                self.model.id.in_(expired),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
+        return result.rowcount
+
+    async def delete_expired(
+            self,
+            booking_ids: list[int],
+            now: datetime,
+    ) -> list[int]:
+        """
+        Deleting the bookings by IDs
+        if their end date has expired.
+        :param booking_ids: Bookings IDs.
+        :param now: Current time.
+        :return: IDs of the deleted bookings.
+        """
+        query = (
+            delete(self.model)
+            .filter(
+                self.model.id.in_(booking_ids),
+                self.model.date_to <= get_expired_until(now),
+            )
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars())
+
+    def stream_expiring(
+            self,
+            now: datetime,
+            until: datetime,
+            chunk_size: int,
+    ) -> AsyncIterator[list[BookingSchema]]:
+        """
+        Reading the bookings expiring
+        in the time interval in chunks.
+        :param now: Interval start, excluded.
+        :param until: Interval end.
+        :param chunk_size: Number of bookings per chunk.
+        :return: Chunks of Pydantic models representing the bookings.
+        """
+        return self.stream_all(
+            self.model.date_to > get_expired_until(now),
+            self.model.date_to <= get_expired_until(until),
+            chunk_size=chunk_size,
         )
-        await self.session.execute(query)
@@ -1,16 +1,59 @@
+from typing import AsyncIterator
+
 from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Float,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
     and_,
+    any_,
+    exists,
+    func,
     insert,
     select,
     update,
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    aggregate_order_by,
+    insert as pg_insert,
+)
+from sqlalchemy.orm import noload
+from sqlalchemy.schema import CreateTable
 
 from src.models.books import Books
+from src.models.books_genres import BooksGenres
 from src.models.genres import Genres
+from src.models.users import Users
 from src.schemas.books import BookSchema
+from src.schemas.imports import BooksImportStatsSchema
+from src.schemas.pagination import (
+    CountStrategy,
+    TotalSchema,
+)
+from src.utils.importer import BOOKS_FEED_COLUMNS
 from src.utils.repository import BaseRepository
 
+BOOKS_IMPORT_LOCK_NAMESPACE = 2
+
+
+books_import = Table(
+    "books_import",
+    MetaData(),
+    Column("name", String),
+    Column("price", Float),
+    Column("author_first_name", String),
+    Column("author_last_name", String),
+    Column("genres", ARRAY(String)),
+    Column("author_id", Integer),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
 
 class BooksRepository(BaseRepository):
     model = Books
@@ -18,6 +61,7 @@ class BooksRepository(BaseRepository):
     async def add_one(self, book_data: dict) -> Books:
         """
         Adding a book to the database.
+        The new book has no genres yet, so they are not loaded.
         :param book_data: Book data.
         :return: The model of the created book.
         """
@@ -25,6 +69,7 @@ class BooksRepository(BaseRepository):
             insert(self.model)
             .values(**book_data)
             .returning(self.model)
+            .options(noload(self.model.genres))
         )
         result = await self.session.execute(statement)
         return result.scalar_one()
@@ -45,24 +90,263 @@ class BooksRepository(BaseRepository):
         result = await self.session.execute(statement)
         return result.scalar_one()
 
-    async def find_with_filters(
+    async def add_genres(self, links: list[dict]) -> None:
+        """
+        Linking books to genres with a single executemany.
+        :param links: List of book and genre ID pairs.
+        :return: None.
+        """
+        await self.session.execute(insert(BooksGenres), links)
+
+    async def find_ids_by_genre(self, genre_id: int) -> list[int]:
+        """
+        Search for the IDs of the books of a genre.
+        :param genre_id: Genre ID.
+        :return: Books IDs.
+        """
+        statement = (
+            select(BooksGenres.book_id)
+            .filter_by(genre_id=genre_id)
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars())
+
+    async def touch(self, obj_ids: list[int]) -> None:
+        """
+        Incrementing the versions of books
+        whose representation changed without an update of their rows.
+        :param obj_ids: Books IDs.
+        :return: None.
+        """
+        if obj_ids:
+            await self.session.execute(
+                update(self.model)
+                .values(version=self.model.version + 1)
+                .filter(self.model.id.in_(obj_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+    async def find_version(self, obj_id: int) -> int:
+        """
+        Search for the version of a book in the database.
+        :param obj_id: Book ID.
+        :return: Book version.
+        """
+        statement = (
+            select(self.model.version)
+            .filter_by(id=obj_id)
+        )
+        result = await self.session.execute(statement)
+        return result.scalar_one()
+
+    async def find_ids_by_author(self, author_id: int) -> list[int]:
+        """
+        Search for the IDs of the books of an author.
+        :param author_id: Author ID.
+        :return: Books IDs.
+        """
+        statement = (
+            select(self.model.id)
+            .filter_by(author_id=author_id)
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars())
+
+    async def import_chunk(
+        self,
+        records: list[tuple],
+    ) -> tuple[BooksImportStatsSchema, set[int]]:
+        """
+        Loading a chunk of feed records into the staging table
+        with COPY and merging it into books and their genres
+        with set-based statements. Authors are resolved by name,
+        records with unknown authors are skipped,
+        unknown genre names are ignored.
+        The merges of concurrent imports are serialized
+        by an advisory lock until the end of the transaction,
+        so they cannot insert the same book twice.
+        The staging table is emptied on commit.
+        :param records: Records in the order of `BOOKS_FEED_COLUMNS`.
+        :return: Pydantic model representing the chunk statistics
+        and the IDs of the books changed by the chunk:
+        the updated books and the books linked to genres,
+        inserted books included.
+        """
+        staging = books_import.c
+        await self.session.execute(CreateTable(books_import, if_not_exists=True))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            books_import.name,
+            records=records,
+            columns=BOOKS_FEED_COLUMNS,
+        )
+
+        resolved = await self.session.execute(
+            update(books_import)
+            .values(author_id=Users.id)
+            .filter(
+                Users.first_name == staging.author_first_name,
+                Users.last_name == staging.author_last_name,
+            )
+        )
+        await self.session.execute(
+            select(func.pg_advisory_xact_lock(BOOKS_IMPORT_LOCK_NAMESPACE, 0))
+        )
+        is_same_book = and_(
+            self.model.author_id == staging.author_id,
+            self.model.name == staging.name,
+        )
+        updated = await self.session.execute(
+            update(self.model)
+            .values(price=staging.price)
+            .filter(is_same_book)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = set(updated.scalars())
+        inserted = await self.session.execute(
+            insert(self.model)
+            .from_select(
+                ["name", "price", "author_id"],
+                select(staging.name, staging.price, staging.author_id)
+                .distinct(staging.author_id, staging.name)
+                .filter(
+                    staging.author_id.is_not(None),
+                    ~exists().where(is_same_book),
+                ),
+            )
+        )
+        linked = await self.session.execute(
+            pg_insert(BooksGenres)
+            .from_select(
+                ["book_id", "genre_id"],
+                select(self.model.id, Genres.id)
+                .join_from(books_import, self.model, is_same_book)
+                .join(Genres, Genres.name == any_(staging.genres)),
+            )
+            .on_conflict_do_nothing(constraint="idx_unique_book_genre")
+            .returning(BooksGenres.book_id)
+        )
+        stats = BooksImportStatsSchema(
+            rows=len(records),
+            skipped=len(records) - resolved.rowcount,
+            inserted=inserted.rowcount,
+            updated=len(updated_ids),
+        )
+        return stats, updated_ids | set(linked.scalars())
+
+    def get_read_statement(self) -> Select:
+        """
+        Building a Core statement that reads books
+        together with their genre names in a single query,
+        without creating ORM instances.
+        :return: Select statement.
+        """
+        genres = func.array_agg(
+            aggregate_order_by(Genres.name, BooksGenres.id),
+        )
+        return (
+            select(
+                self.model.id,
+                self.model.name,
+                self.model.price,
+                self.model.author_id,
+                func.array_remove(genres, None).label("genres"),
+                self.model.version,
+            )
+            .outerjoin(BooksGenres, BooksGenres.book_id == self.model.id)
+            .outerjoin(Genres, Genres.id == BooksGenres.genre_id)
+            .group_by(self.model.id)
+        )
+
+    async def find_one(self, **filter_by) -> BookSchema:
+        """
+        Search for a book by filters in the database.
+        :param filter_by: Filters.
+        :return: Pydantic model representing the book.
+        """
+        statement = self.get_read_statement().filter(
+            *(
+                getattr(self.model, name) == value
+                for name, value in filter_by.items()
+            )
+        )
+        result = await self.session.execute(statement)
+        return BookSchema.model_validate(result.one()._mapping)
+
+    async def find_many(self, obj_ids: list[int]) -> list[BookSchema]:
+        """
+        Search for books by IDs in the database.
+        Unknown IDs are skipped.
+        :param obj_ids: Books IDs.
+        :return: List of Pydantic models representing the book.
+        """
+        return await self.find_all(self.model.id.in_(obj_ids))
+
+    async def find_all(
+        self,
+        *filters: ColumnElement[bool],
+        limit: int | None = None,
+        offset: int | None = None,
+        after_id: int | None = None,
+    ) -> list[BookSchema]:
+        """
+        Getting books from the database ordered by ID.
+        :param filters: Filter expressions.
+        :param limit: Maximum number of books.
+        :param offset: Number of books to skip.
+        :param after_id: ID after which books are returned.
+        :return: List of Pydantic models representing the book.
+        """
+        statement = self.paginate(
+            self.get_read_statement().filter(*filters),
+            limit,
+            offset,
+            after_id,
+        )
+        result = await self.session.execute(statement)
+        return [BookSchema.model_validate(row._mapping) for row in result]
+
+    async def stream_all(
+        self,
+        *filters: ColumnElement[bool],
+        chunk_size: int,
+    ) -> AsyncIterator[list[BookSchema]]:
+        """
+        Reading books from the database ordered by ID
+        through a server-side cursor in fixed-size chunks.
+        :param filters: Filter expressions.
+        :param chunk_size: Number of books per chunk.
+        :return: Chunks of Pydantic models representing the book.
+        """
+        statement = (
+            self.get_read_statement()
+            .filter(*filters)
+            .order_by(self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(statement)
+        async for partition in result.partitions():
+            yield [BookSchema.model_validate(row._mapping) for row in partition]
+
+    def get_filters(
         self,
         author_name: str = None,
         author_surname: str = None,
         genres: list[str] = None,
         min_price: float = None,
         max_price: float = None,
-    ) -> list[BookSchema]:
+    ) -> list[ColumnElement[bool]]:
         """
-        Search for books in the database by filters.
+        Building filter expressions for the book search.
         :param author_name: Author's name.
         :param author_surname: Author's surname
         :param genres: List of genres.
         :param min_price: Minimal price.
         :param max_price: Maximum price.
-        :return: List of Pydantic models representing the book.
+        :return: List of filter expressions.
         """
-        statement = select(self.model)
         filters = []
 
         if author_name:
@@ -70,16 +354,107 @@ class BooksRepository(BaseRepository):
         if author_surname:
             filters.append(self.model.author.has(last_name=author_surname))
         if genres:
-            statement = statement.options(selectinload(self.model.genres))
             filters.append(self.model.genres.any(Genres.name.in_(genres)))
         if min_price:
             filters.append(self.model.price >= min_price)
         if max_price:
             filters.append(self.model.price <= max_price)
 
-        if filters:
-            statement = statement.filter(and_(*filters))
+        return filters
 
-        result = await self.session.execute(statement)
-        result = [row[0].to_read_model() for row in result.all()]
-        return result
+    async def find_with_filters(
+        self,
+        author_name: str = None,
+        author_surname: str = None,
+        genres: list[str] = None,
+        min_price: float = None,
+        max_price: float = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after_id: int | None = None,
+    ) -> list[BookSchema]:
+        """
+        Search for books in the database by filters.
+        :param author_name: Author's name.
+        :param author_surname: Author's surname
+        :param genres: List of genres.
+        :param min_price: Minimal price.
+        :param max_price: Maximum price.
+        :param limit: Maximum number of books.
+        :param offset: Number of books to skip.
+        :param after_id: ID after which books are returned.
+        :return: List of Pydantic models representing the book.
+        """
+        filters = self.get_filters(
+            author_name,
+            author_surname,
+            genres,
+            min_price,
+            max_price,
+        )
+        return await self.find_all(
+            *filters,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+        )
+
+    def stream_with_filters(
+        self,
+        author_name: str = None,
+        author_surname: str = None,
+        genres: list[str] = None,
+        min_price: float = None,
+        max_price: float = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[BookSchema]]:
+        """
+        Reading books by filters in fixed-size chunks.
+        :param author_name: Author's name.
+        :param author_surname: Author's surname
+        :param genres: List of genres.
+        :param min_price: Minimal price.
+        :param max_price: Maximum price.
+        :param chunk_size: Number of books per chunk.
+        :return: Chunks of Pydantic models representing the book.
+        """
+        filters = self.get_filters(
+            author_name,
+            author_surname,
+            genres,
+            min_price,
+            max_price,
+        )
+        return self.stream_all(
+            *filters,
+            chunk_size=chunk_size,
+        )
+
+    async def count_with_filters(
+        self,
+        strategy: CountStrategy | None,
+        author_name: str = None,
+        author_surname: str = None,
+        genres: list[str] = None,
+        min_price: float = None,
+        max_price: float = None,
+    ) -> TotalSchema | None:
+        """
+        Counting books in the database by filters.
+        :param strategy: Counting strategy, None to skip the count.
+        :param author_name: Author's name.
+        :param author_surname: Author's surname
+        :param genres: List of genres.
+        :param min_price: Minimal price.
+        :param max_price: Maximum price.
+        :return: Pydantic model representing the total
+                 or None if the count was skipped.
+        """
+        filters = self.get_filters(
+            author_name,
+            author_surname,
+            genres,
+            min_price,
+            max_price,
+        )
+        return await self.count_total(strategy, *filters)
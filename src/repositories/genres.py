@@ -28,3 +28,20 @@ class GenresRepository(BaseRepository):
         if len(genres) == len(names):
             return genres
         raise IncorrectNamesOfGenreException
+
+    async def find_ids_by_names(
+            self,
+            names: list[str],
+    ) -> dict[str, int]:
+        """
+        Search for genre IDs by name.
+        Unknown names are skipped.
+        :param names: List of names.
+        :return: Mapping of genre names to IDs.
+        """
+        query = (
+            select(self.model.name, self.model.id)
+            .filter(self.model.name.in_(names))
+        )
+        result = await self.session.execute(query)
+        return dict(result.tuples().all())
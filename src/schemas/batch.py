@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class BatchIdsSchema(BaseModel):
+    ids: list[int]
+
+
+class BatchItemErrorSchema(BaseModel):
+    index: int
+    detail: str
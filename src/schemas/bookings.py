@@ -1,4 +1,14 @@
-from pydantic import BaseModel
+from datetime import (
+    date,
+    datetime,
+)
+from enum import Enum
+from typing import Annotated
+
+from pydantic import (
+    BaseModel,
+    Field,
+)
 
 from src.schemas.mixins.bookings import (
     DateMixin,
@@ -6,6 +16,12 @@ from src.schemas.mixins.bookings import (
 )
 
 
+class BookingLockMode(str, Enum):
+    NONE = "none"
+    ADVISORY = "advisory"
+    ROW = "row"
+
+
 class BookingIdSchema(BaseModel):
     booking_id: int
 
@@ -21,11 +37,57 @@ class AddBookingSchema(
     DateMixin,
     RelationMixin,
 ):
-    pass
+    hold_id: str | None = None
 
 
 class UpdateBookingSchema(
     DateMixin,
     RelationMixin,
+):
+    hold_id: str | None = None
+
+
+class BookingWriteSchema(BaseModel):
+    booking_id: int | None
+    user_exists: bool
+    book_exists: bool
+    is_booked: bool
+    is_found: bool = True
+
+
+class AddHoldSchema(
+    DateMixin,
+    RelationMixin,
 ):
     pass
+
+
+class HoldSchema(
+    DateMixin,
+    RelationMixin,
+):
+    hold_id: str
+    expires_at: datetime
+
+
+class PeriodSchema(DateMixin):
+    pass
+
+
+class BookAvailabilitySchema(BaseModel):
+    book_id: int
+    busy: list[PeriodSchema]
+    free: list[PeriodSchema]
+
+
+class CheckBookingSchema(DateMixin):
+    book_id: Annotated[int, Field(ge=1)]
+
+
+class BookingConflictSchema(BaseModel):
+    index: int
+    book_id: int
+    date_from: date
+    date_to: date
+    booking_ids: list[int]
+    user_ids: list[int]
@@ -10,6 +10,7 @@ from src.schemas.mixins.books import (
     PriceMixin,
     RelationAuthorMixin,
 )
+from src.schemas.pagination import TotalSchema
 
 
 class BookSchema(
@@ -19,6 +20,7 @@ class BookSchema(
 ):
     id: int
     genres: list[str]
+    version: int
 
 
 class BookFiltersSchema(BaseModel):
@@ -32,6 +34,11 @@ class BookIdSchema(BaseModel):
     book_id: int
 
 
+class BookIdsPageSchema(BaseModel):
+    ids: list[int]
+    total: TotalSchema | None
+
+
 class AddBookSchema(
     NameMixin,
     PriceMixin,
@@ -46,3 +53,11 @@ class UpdateBookSchema(
     RelationAuthorMixin,
 ):
     pass
+
+
+class AddBookBatchSchema(
+    NameMixin,
+    PriceMixin,
+    RelationAuthorMixin,
+):
+    genres: list[str] = []
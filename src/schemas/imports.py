@@ -0,0 +1,18 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ImportFormat(str, Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+class BooksImportStatsSchema(BaseModel):
+    rows: int = 0
+    invalid: int = 0
+    skipped: int = 0
+    inserted: int = 0
+    updated: int = 0
+    elapsed: float = 0.0
+    rows_per_second: float = 0.0
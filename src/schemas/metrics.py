@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+
+
+class BookLockStatsSchema(BaseModel):
+    book_id: int
+    acquired: int
+    timeouts: int
+    wait_total_ms: float
+    wait_max_ms: float
+
+
+class LockMetricsSchema(BaseModel):
+    mode: str
+    acquired: int
+    timeouts: int
+    wait_total_ms: float
+    evicted_books: int
+    books: list[BookLockStatsSchema]
+
+
+class PoolStatsSchema(BaseModel):
+    pid: int
+    engine: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+
+
+class CacheStatsSchema(BaseModel):
+    name: str
+    local_hits: int
+    hits: int
+    misses: int
+    errors: int
+    hit_ratio: float | None
+
+
+class CacheMetricsSchema(BaseModel):
+    pid: int
+    local_entries: int
+    local_bytes: int
+    local_max_bytes: int
+    local_active: bool
+    caches: list[CacheStatsSchema]
+
+
+class SingleFlightStatsSchema(BaseModel):
+    name: str
+    leaders: int
+    merged: int
+    timeouts: int
+    abandoned: int
@@ -0,0 +1,96 @@
+from enum import Enum
+from typing import (
+    Generic,
+    TypeVar,
+)
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from src.config.config import settings
+
+T = TypeVar("T")
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CAPPED = "capped"
+    ESTIMATED = "estimated"
+
+
+class TotalRelation(str, Enum):
+    EQ = "eq"
+    GTE = "gte"
+    APPROX = "approx"
+
+
+class TotalSchema(BaseModel):
+    value: int
+    relation: TotalRelation
+
+
+class PaginationParams(BaseModel):
+    page: int = Query(
+        1,
+        ge=1,
+        description="Page number",
+    )
+    size: int = Query(
+        10,
+        ge=1,
+        le=100,
+        description="Page size",
+    )
+    after_id: int | None = Query(
+        None,
+        ge=0,
+        description="ID of the last item on the previous page "
+                    "(keyset pagination, overrides the page number)",
+    )
+    include_total: bool = Query(
+        True,
+        description="Whether to count the total number of items",
+    )
+    count: CountStrategy | None = Query(
+        None,
+        description="Counting strategy (the server default if not set)",
+    )
+
+    @property
+    def limit(self) -> int:
+        """
+        Number of rows to fetch: one extra row
+        shows whether there is a next page.
+        :return: Limit.
+        """
+        return self.size + 1
+
+    @property
+    def offset(self) -> int | None:
+        """
+        Number of rows to skip in offset mode.
+        :return: Offset or None in keyset mode.
+        """
+        if self.after_id is not None:
+            return None
+        return (self.page - 1) * self.size
+
+    @property
+    def count_strategy(self) -> CountStrategy | None:
+        """
+        Strategy for counting the total number of items.
+        :return: Counting strategy or None if the count is skipped.
+        """
+        if not self.include_total:
+            return None
+        return self.count or CountStrategy(settings.pagination.COUNT_STRATEGY)
+
+
+class BasePaginationResponse(BaseModel, Generic[T]):
+    items: list[T]
+    total: int | None
+    total_relation: TotalRelation | None
+    page: int | None
+    size: int
+    pages: int | None
+    next_after_id: int | None = None
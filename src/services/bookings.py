@@ -1,19 +1,76 @@
-from sqlalchemy.exc import NoResultFound
+import logging
+import time
+from collections import defaultdict
+from datetime import (
+    date,
+    datetime,
+    timezone,
+)
+from typing import (
+    AsyncIterator,
+    NoReturn,
+    Sequence,
+)
+from uuid import uuid4
 
+from redis.exceptions import RedisError
+from sqlalchemy.exc import (
+    DBAPIError,
+    IntegrityError,
+    NoResultFound,
+)
+
+from src.config.config import settings
+from src.db.errors import (
+    CHECK_VIOLATION,
+    EXCLUSION_VIOLATION,
+    FOREIGN_KEY_VIOLATION,
+    LOCK_NOT_AVAILABLE,
+    get_sqlstate,
+)
+from src.db.partitions import get_partitioned_range
+from src.exceptions.batch import BatchValidationException
 from src.exceptions.bookings import (
+    BookingDatesOutOfRangeException,
     BookingWasNotFoundException,
     BookIsBookedException,
+    BookIsHeldException,
+    BookIsLockedException,
     DateFromCannotBeAfterDateToException,
+    HoldsAreUnavailableException,
     InvalidUserOrBookDataException,
 )
+from src.schemas.batch import (
+    BatchIdsSchema,
+    BatchItemErrorSchema,
+)
 from src.schemas.bookings import (
     AddBookingSchema,
+    AddHoldSchema,
+    BookAvailabilitySchema,
+    BookingConflictSchema,
     BookingIdSchema,
+    BookingLockMode,
     BookingSchema,
+    BookingWriteSchema,
+    CheckBookingSchema,
+    HoldSchema,
     UpdateBookingSchema,
 )
+from src.schemas.export import ExportFormat
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
+from src.utils.expiry import booking_expiry
+from src.utils.export import serialize
+from src.utils.holds import booking_holds
+from src.utils.metrics import booking_lock_metrics
+from src.utils.pagination import Paginator
 from src.utils.transaction import BaseManager
 
+logger = logging.getLogger(__name__)
+
 
 class BookingsService:
     @staticmethod
@@ -39,15 +96,105 @@ class BookingsService:
     @staticmethod
     async def get_all_bookings(
         transaction: BaseManager,
-    ) -> list[BookingSchema]:
+        pagination: PaginationParams,
+    ) -> BasePaginationResponse[BookingSchema]:
         """
         The logic of receiving all bookings.
         :param transaction: Database transaction.
-        :return: List of Pydantic models representing the bookings.
+        :param pagination: Pagination params.
+        :return: Page of Pydantic models representing the bookings.
+        """
+        async with transaction:
+            bookings = await transaction.bookings_repo.find_all(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                after_id=pagination.after_id,
+            )
+            total = await transaction.bookings_repo.count_total(
+                pagination.count_strategy,
+            )
+            paginator = Paginator(
+                items=bookings,
+                params=pagination,
+                total=total,
+            )
+            return paginator.get_response()
+
+    @staticmethod
+    async def get_availability(
+        transaction: BaseManager,
+        book_ids: list[int],
+        date_from: date,
+        date_to: date,
+    ) -> list[BookAvailabilitySchema]:
+        """
+        The logic of getting the availability of books.
+        :param transaction: Database transaction.
+        :param book_ids: Books IDs.
+        :param date_from: Window start date.
+        :param date_to: Window end date.
+        :return: List of Pydantic models representing
+                 the availability of the books.
         """
+        if date_from > date_to:
+            raise DateFromCannotBeAfterDateToException
+
         async with transaction:
-            bookings = await transaction.bookings_repo.find_all()
-            return bookings
+            availability = await transaction.bookings_repo.find_availability(
+                book_ids,
+                date_from,
+                date_to,
+            )
+            return availability
+
+    @staticmethod
+    async def check_bookings(
+        transaction: BaseManager,
+        periods: list[CheckBookingSchema],
+    ) -> list[BookingConflictSchema]:
+        """
+        The logic of checking the availability
+        of many books on the requested dates at once.
+        :param transaction: Database transaction.
+        :param periods: List of Pydantic models representing
+                        the requested books and dates.
+        :return: List of Pydantic models representing the conflicts.
+        """
+        errors = [
+            BatchItemErrorSchema(
+                index=index,
+                detail=DateFromCannotBeAfterDateToException.detail,
+            )
+            for index, period in enumerate(periods)
+            if period.date_from > period.date_to
+        ]
+        if errors:
+            raise BatchValidationException(errors)
+
+        async with transaction:
+            conflicts = await transaction.bookings_repo.find_conflicts(
+                periods,
+            )
+            return conflicts
+
+    @staticmethod
+    async def export_bookings(
+        transaction: BaseManager,
+        export_format: ExportFormat,
+    ) -> AsyncIterator[str]:
+        """
+        The logic of exporting all bookings.
+        The session stays open while the response is streamed.
+        :param transaction: Database transaction.
+        :param export_format: Export format.
+        :return: Serialized chunks of bookings.
+        """
+        async with transaction:
+            chunks = transaction.bookings_repo.stream_all(
+                chunk_size=settings.export.CHUNK_SIZE,
+            )
+            async for data in serialize(chunks, export_format):
+                yield data
 
     @classmethod
     async def add_booking(
@@ -57,23 +204,173 @@ class BookingsService:
     ) -> BookingIdSchema:
         """
         The logic of creating a booking.
+        Books held by other users are rejected before
+        the database is queried, the hold given with the booking
+        is released once the booking is created.
+        The user, the book and the dates are checked
+        by the same statement that inserts the booking,
+        concurrent overlapping bookings are rejected
+        by the exclusion constraint of the table.
         :param transaction: Database transaction.
         :param booking_data: Pydantic model representing booking data.
         :return: Pydantic model representing the created booking ID.
         """
+        cls.validate_booking_data(booking_data)
+        await cls.check_holds(booking_data)
+        try:
+            async with transaction:
+                await cls.lock_books(transaction, [booking_data.book_id])
+                result = await transaction.bookings_repo.add_checked(
+                    booking_data.model_dump(exclude={"hold_id"}),
+                )
+                cls.validate_write_result(result)
+                await transaction.commit()
+        except IntegrityError as error:
+            cls.raise_for_integrity_error(error)
+        await cls.release_holds([booking_data])
+        await cls.schedule_expiry({result.booking_id: booking_data.date_to})
+        return BookingIdSchema(booking_id=result.booking_id)
+
+    @classmethod
+    async def add_hold(
+        cls,
+        transaction: BaseManager,
+        hold_data: AddHoldSchema,
+    ) -> HoldSchema:
+        """
+        The logic of holding a book on the requested dates
+        while the user confirms the booking.
+        The hold is placed in Redis and expires by itself,
+        it is released at once if the book is already booked.
+        Holds cannot be placed while Redis is unavailable.
+        :param transaction: Database transaction.
+        :param hold_data: Pydantic model representing hold data.
+        :return: Pydantic model representing the hold.
+        """
+        cls.validate_booking_data(hold_data)
+        hold_id = uuid4().hex
+        try:
+            expires_at = await booking_holds.place(
+                hold_id,
+                hold_data.book_id,
+                hold_data.user_id,
+                hold_data.date_from,
+                hold_data.date_to,
+                settings.bookings.HOLD_TTL_SECONDS * 1000,
+            )
+        except RedisError:
+            logger.warning("Booking holds are unavailable", exc_info=True)
+            raise HoldsAreUnavailableException
+        if expires_at is None:
+            raise BookIsHeldException
+        hold = HoldSchema(
+            **hold_data.model_dump(),
+            hold_id=hold_id,
+            expires_at=datetime.fromtimestamp(
+                expires_at / 1000,
+                tz=timezone.utc,
+            ),
+        )
+
         async with transaction:
-            is_booked = await cls.validate_booking_data(
-                transaction,
-                booking_data,
+            booked_by = await transaction.bookings_repo.check_booking(
+                hold_data.book_id,
+                hold_data.date_from,
+                hold_data.date_to,
             )
+        if booked_by is not None:
+            await cls.release_holds([hold])
+            raise BookIsBookedException
+        return hold
 
-            if is_booked:
-                raise BookIsBookedException
-            booking_id = await transaction.bookings_repo.add_one(
-                booking_data.model_dump(),
+    @classmethod
+    async def add_bookings(
+        cls,
+        transaction: BaseManager,
+        bookings_data: list[AddBookingSchema],
+    ) -> BatchIdsSchema:
+        """
+        The logic of creating bookings in a single transaction.
+        Bookings are checked against the holds of other users,
+        the existing bookings and the previous items of the batch.
+        Nothing is written if any of the bookings is invalid.
+        :param transaction: Database transaction.
+        :param bookings_data: List of Pydantic models representing booking data.
+        :return: Pydantic model representing the created bookings IDs.
+        """
+        ordered = [
+            (index, booking)
+            for index, booking in enumerate(bookings_data)
+            if booking.date_from <= booking.date_to
+        ]
+        held_positions = await cls.find_held(
+            [booking for _, booking in ordered],
+        )
+        held = {ordered[position][0] for position in held_positions}
+        async with transaction:
+            await cls.lock_books(
+                transaction,
+                [booking.book_id for booking in bookings_data],
             )
+            existing_user_ids = await transaction.users_repo.find_existing_ids(
+                [booking.user_id for booking in bookings_data],
+            )
+            existing_book_ids = await transaction.books_repo.find_existing_ids(
+                [booking.book_id for booking in bookings_data],
+            )
+            conflicts = await transaction.bookings_repo.find_conflicts(
+                [booking for _, booking in ordered],
+            )
+            booked = {ordered[conflict.index][0] for conflict in conflicts}
+            periods = defaultdict(list)
+
+            errors = []
+            for index, booking in enumerate(bookings_data):
+                if booking.date_from > booking.date_to:
+                    detail = DateFromCannotBeAfterDateToException.detail
+                elif not cls.is_partitioned_date(booking.date_to):
+                    detail = cls.get_dates_out_of_range_exception().detail
+                elif (
+                    booking.user_id not in existing_user_ids
+                    or booking.book_id not in existing_book_ids
+                ):
+                    detail = InvalidUserOrBookDataException.detail
+                elif index in held:
+                    detail = BookIsHeldException.detail
+                elif index in booked or any(
+                    date_from <= booking.date_to and booking.date_from <= date_to
+                    for date_from, date_to in periods[booking.book_id]
+                ):
+                    detail = BookIsBookedException.detail
+                else:
+                    periods[booking.book_id].append(
+                        (booking.date_from, booking.date_to),
+                    )
+                    continue
+                errors.append(
+                    BatchItemErrorSchema(index=index, detail=detail),
+                )
+            if errors:
+                raise BatchValidationException(errors)
+
+            try:
+                booking_ids = await transaction.bookings_repo.add_many(
+                    [
+                        booking.model_dump(exclude={"hold_id"})
+                        for booking in bookings_data
+                    ],
+                )
+            except IntegrityError as error:
+                cls.raise_for_integrity_error(error)
             await transaction.commit()
-            return BookingIdSchema(booking_id=booking_id)
+        await cls.release_holds(bookings_data)
+        await cls.schedule_expiry(
+            {
+                booking_id: booking.date_to
+                for booking_id, booking in zip(booking_ids, bookings_data)
+            },
+        )
+        return BatchIdsSchema(ids=booking_ids)
 
     @classmethod
     async def update_booking(
@@ -84,29 +381,38 @@ class BookingsService:
     ) -> BookingIdSchema:
         """
         The logic of updating a booking by ID
+        Books held by other users are rejected before
+        the database is queried, the hold given with the booking
+        is released once the booking is updated.
+        The booking, the user, the book and the dates are checked
+        by the same statement that updates the booking,
+        concurrent overlapping bookings are rejected
+        by the exclusion constraint of the table.
         :param transaction: Database transaction.
         :param booking_id: Booking ID.
         :param booking_data: Pydantic model representing booking data.
         :return: Pydantic model representing the updated booking ID.
         """
-        async with transaction:
-            is_booked = await cls.validate_booking_data(
-                transaction,
-                booking_data,
-            )
-            if is_booked and is_booked != booking_data.user_id:
-                raise BookIsBookedException
-
-            booking_data_dict = booking_data.model_dump()
-            await transaction.bookings_repo.edit_one(
-                obj_id=booking_id,
-                data=booking_data_dict,
-            )
-            await transaction.commit()
-            return BookingIdSchema(booking_id=booking_id)
+        cls.validate_booking_data(booking_data)
+        await cls.check_holds(booking_data)
+        try:
+            async with transaction:
+                await cls.lock_books(transaction, [booking_data.book_id])
+                result = await transaction.bookings_repo.edit_checked(
+                    booking_id=booking_id,
+                    data=booking_data.model_dump(exclude={"hold_id"}),
+                )
+                cls.validate_write_result(result)
+                await transaction.commit()
+        except IntegrityError as error:
+            cls.raise_for_integrity_error(error)
+        await cls.release_holds([booking_data])
+        await cls.schedule_expiry({booking_id: booking_data.date_to})
+        return BookingIdSchema(booking_id=result.booking_id)
 
-    @staticmethod
+    @classmethod
     async def delete_booking(
+        cls,
         transaction: BaseManager,
         booking_id: int,
     ) -> None:
@@ -128,36 +434,222 @@ class BookingsService:
                 obj_id=booking_id,
             )
             await transaction.commit()
+        await cls.unschedule_expiry(booking_id)
 
     @staticmethod
-    async def validate_booking_data(
+    async def lock_books(
         transaction: BaseManager,
-        booking_data: AddBookingSchema | UpdateBookingSchema,
-    ) -> int | bool:
+        book_ids: list[int],
+    ) -> None:
         """
-        Validation of booking data.
+        Locking the books for booking writes
+        if the locking mode is enabled.
+        The lock wait time is recorded in the lock metrics.
         :param transaction: Database transaction.
-        :param booking_data: Pydantic model representing booking data.
-        :return: User ID if the data has been verified
-                 and None if not.
+        :param book_ids: Books IDs.
+        :return: None.
         """
-        if booking_data.date_from > booking_data.date_to:
-            raise DateFromCannotBeAfterDateToException
+        mode = BookingLockMode(settings.bookings.LOCK_MODE)
+        if mode is BookingLockMode.NONE:
+            return
 
-        async with transaction:
-            try:
-                await transaction.users_repo.find_one(
-                    id=booking_data.user_id,
-                )
-                await transaction.books_repo.find_one(
-                    id=booking_data.book_id,
-                )
-            except NoResultFound:
-                raise InvalidUserOrBookDataException
+        started = time.perf_counter()
+        acquired = True
+        try:
+            await transaction.bookings_repo.lock_books(
+                book_ids,
+                mode,
+                settings.bookings.LOCK_TIMEOUT_MS,
+            )
+        except DBAPIError as error:
+            if get_sqlstate(error) != LOCK_NOT_AVAILABLE:
+                raise
+            acquired = False
+        wait = time.perf_counter() - started
+        for book_id in set(book_ids):
+            booking_lock_metrics.observe(book_id, wait, acquired)
+        if not acquired:
+            raise BookIsLockedException
 
-            is_booked = await transaction.bookings_repo.check_booking(
+    @staticmethod
+    async def check_holds(
+        booking_data: AddBookingSchema | UpdateBookingSchema,
+    ) -> None:
+        """
+        Checking that the book is not held by other users.
+        The check is skipped if Redis is unavailable.
+        :param booking_data: Pydantic model representing booking data.
+        :return: None.
+        """
+        try:
+            is_free = await booking_holds.is_free(
                 booking_data.book_id,
+                booking_data.user_id,
                 booking_data.date_from,
                 booking_data.date_to,
             )
-            return is_booked
+        except RedisError:
+            logger.warning("Booking holds are unavailable", exc_info=True)
+            return
+        if not is_free:
+            raise BookIsHeldException
+
+    @staticmethod
+    async def find_held(
+        bookings_data: Sequence[AddBookingSchema],
+    ) -> set[int]:
+        """
+        Search for the bookings on books held by other users.
+        The check is skipped if Redis is unavailable.
+        :param bookings_data: Pydantic models representing booking data.
+        :return: Indexes of the held bookings.
+        """
+        if not bookings_data:
+            return set()
+        try:
+            held = await booking_holds.find_held(
+                [
+                    (
+                        booking.book_id,
+                        booking.user_id,
+                        booking.date_from,
+                        booking.date_to,
+                    )
+                    for booking in bookings_data
+                ],
+            )
+        except RedisError:
+            logger.warning("Booking holds are unavailable", exc_info=True)
+            return set()
+        return {index for index, is_held in enumerate(held) if is_held}
+
+    @staticmethod
+    async def release_holds(
+        bookings_data: Sequence[
+            AddBookingSchema | UpdateBookingSchema | HoldSchema
+        ],
+    ) -> None:
+        """
+        Releasing the holds given with the bookings.
+        Holds that cannot be released expire by themselves.
+        :param bookings_data: Pydantic models representing booking data.
+        :return: None.
+        """
+        try:
+            for booking_data in bookings_data:
+                if booking_data.hold_id is not None:
+                    await booking_holds.release(
+                        booking_data.hold_id,
+                        booking_data.book_id,
+                        booking_data.user_id,
+                    )
+        except RedisError:
+            logger.warning("Booking holds are unavailable", exc_info=True)
+
+    @staticmethod
+    async def schedule_expiry(expirations: dict[int, date]) -> None:
+        """
+        Scheduling the expiry of bookings.
+        Bookings missed while Redis is unavailable
+        are scheduled by the reconciliation task.
+        :param expirations: Bookings end dates by bookings IDs.
+        :return: None.
+        """
+        try:
+            await booking_expiry.schedule(expirations)
+        except RedisError:
+            logger.warning("Bookings expiry is unavailable", exc_info=True)
+
+    @staticmethod
+    async def unschedule_expiry(booking_id: int) -> None:
+        """
+        Removing a deleted booking from the expiry schedule.
+        Bookings left in the schedule are skipped on expiry.
+        :param booking_id: Booking ID.
+        :return: None.
+        """
+        try:
+            await booking_expiry.unschedule(booking_id)
+        except RedisError:
+            logger.warning("Bookings expiry is unavailable", exc_info=True)
+
+    @staticmethod
+    def get_partitioned_range() -> tuple[date, date]:
+        """
+        Getting the range of the booking end dates covered by the partitions:
+        from the start of the current month
+        to the end of the last month created ahead.
+        :return: First covered date and first date after the range.
+        """
+        return get_partitioned_range(
+            date.today(),
+            settings.bookings.PARTITIONS_AHEAD,
+        )
+
+    @classmethod
+    def get_dates_out_of_range_exception(
+        cls,
+    ) -> BookingDatesOutOfRangeException:
+        """
+        Building the error of an end date not covered by the partitions.
+        :return: Exception naming the current range of the end dates.
+        """
+        return BookingDatesOutOfRangeException(*cls.get_partitioned_range())
+
+    @classmethod
+    def is_partitioned_date(cls, date_to: date) -> bool:
+        """
+        Checking that the bookings partition of an end date exists.
+        :param date_to: Booking end date.
+        :return: True if the end date is covered by the partitions.
+        """
+        start, end = cls.get_partitioned_range()
+        return start <= date_to < end
+
+    @classmethod
+    def validate_booking_data(
+        cls,
+        booking_data: AddBookingSchema | UpdateBookingSchema | AddHoldSchema,
+    ) -> None:
+        """
+        Validation of booking data.
+        :param booking_data: Pydantic model representing booking data.
+        :return: None.
+        """
+        if booking_data.date_from > booking_data.date_to:
+            raise DateFromCannotBeAfterDateToException
+        if not cls.is_partitioned_date(booking_data.date_to):
+            raise cls.get_dates_out_of_range_exception()
+
+    @staticmethod
+    def validate_write_result(result: BookingWriteSchema) -> None:
+        """
+        Validation of the result of a booking write.
+        :param result: Pydantic model representing the write result.
+        :return: None.
+        """
+        if not result.is_found:
+            raise BookingWasNotFoundException
+        if not result.user_exists or not result.book_exists:
+            raise InvalidUserOrBookDataException
+        if result.is_booked:
+            raise BookIsBookedException
+
+    @classmethod
+    def raise_for_integrity_error(cls, error: IntegrityError) -> NoReturn:
+        """
+        Converting an integrity error of a booking write:
+        a booking without a partition for its end date
+        (the partitions of a new month are not created yet)
+        or a conflict with a concurrent transaction.
+        :param error: SQLAlchemy integrity error.
+        :return: None.
+        """
+        sqlstate = get_sqlstate(error)
+        if sqlstate == CHECK_VIOLATION:
+            raise cls.get_dates_out_of_range_exception()
+        if sqlstate == EXCLUSION_VIOLATION:
+            raise BookIsBookedException
+        if sqlstate == FOREIGN_KEY_VIOLATION:
+            raise InvalidUserOrBookDataException
+        raise error
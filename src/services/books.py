@@ -1,19 +1,52 @@
+import json
+from typing import AsyncIterator
+
 from sqlalchemy.exc import (
     IntegrityError,
     NoResultFound,
 )
 
+from src.config.config import settings
+from src.exceptions.batch import BatchValidationException
 from src.exceptions.books import (
     BookWasNotFoundException,
     IncorrectAuthorException,
 )
+from src.exceptions.genres import IncorrectNamesOfGenreException
+from src.schemas.batch import (
+    BatchIdsSchema,
+    BatchItemErrorSchema,
+)
 from src.schemas.books import (
+    AddBookBatchSchema,
     AddBookSchema,
     BookIdSchema,
+    BookIdsPageSchema,
     BookFiltersSchema,
     BookSchema,
     UpdateBookSchema,
 )
+from src.schemas.export import ExportFormat
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+    TotalSchema,
+)
+from src.utils.cache import (
+    book_cache,
+    books_filters_cache,
+)
+from src.utils.etags import (
+    get_row_etag,
+    make_etag,
+    table_versions,
+)
+from src.utils.export import serialize
+from src.utils.pagination import Paginator
+from src.utils.singleflight import (
+    book_reads,
+    books_filters_reads,
+)
 from src.utils.transaction import BaseManager
 
 
@@ -25,31 +58,96 @@ class BooksService:
     ) -> BookSchema:
         """
         The logic of getting a book by ID.
+        The book is read through the cache,
+        the transaction is not opened on a hit.
+        Identical concurrent reads share a single read.
         :param transaction: Database transaction.
         :param book_id: Book ID.
         :return: Pydantic model representing the book.
         """
-        try:
+        async def load_book() -> BookSchema:
             async with transaction:
-                book = await transaction.books_repo.find_one(
+                return await transaction.books_repo.find_one(
                     id=book_id,
                 )
-                return book
+
+        async def read_book() -> BookSchema:
+            return await book_cache.get_or_load(book_id, load_book)
+
+        try:
+            return await book_reads.run(
+                (book_id, transaction.read_only),
+                read_book,
+            )
+        except NoResultFound:
+            raise BookWasNotFoundException
+
+    @staticmethod
+    async def get_book_etag(
+        transaction: BaseManager,
+        book_id: int,
+    ) -> str:
+        """
+        The logic of getting the ETag of a book
+        from its version, without loading the book.
+        :param transaction: Database transaction.
+        :param book_id: Book ID.
+        :return: Quoted entity tag.
+        """
+        try:
+            async with transaction:
+                version = await transaction.books_repo.find_version(book_id)
         except NoResultFound:
             raise BookWasNotFoundException
+        return get_row_etag("books", book_id, version)
+
+    @staticmethod
+    async def get_all_books_etag(
+        transaction: BaseManager,
+        pagination: PaginationParams,
+    ) -> str | None:
+        """
+        The logic of getting the ETag of a page of books
+        from the versions of the books and genres tables,
+        without loading the books.
+        :param transaction: Database transaction.
+        :param pagination: Pagination params.
+        :return: Quoted entity tag or None if it is unavailable.
+        """
+        versions = await table_versions.get(
+            ["books", "genres"],
+            transaction.read_only,
+        )
+        if versions is None:
+            return None
+        return make_etag("books", *versions, pagination.model_dump_json())
 
     @staticmethod
     async def get_all_books(
         transaction: BaseManager,
-    ) -> list[BookSchema]:
+        pagination: PaginationParams,
+    ) -> BasePaginationResponse[BookSchema]:
         """
         The logic of getting all the books.
         :param transaction: Database transaction.
-        :return: List of Pydantic models representing the book.
+        :param pagination: Pagination params.
+        :return: Page of Pydantic models representing the book.
         """
         async with transaction:
-            books = await transaction.books_repo.find_all()
-            return books
+            books = await transaction.books_repo.find_all(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                after_id=pagination.after_id,
+            )
+            total = await transaction.books_repo.count_total(
+                pagination.count_strategy,
+            )
+            paginator = Paginator(
+                items=books,
+                params=pagination,
+                total=total,
+            )
+            return paginator.get_response()
 
     @staticmethod
     async def add_book(
@@ -74,7 +172,58 @@ class BooksService:
             )
             new_book.genres = genres
             await transaction.commit()
-            return BookIdSchema(book_id=new_book.id)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("books")
+        return BookIdSchema(book_id=new_book.id)
+
+    @staticmethod
+    async def add_books(
+        transaction: BaseManager,
+        books_data: list[AddBookBatchSchema],
+    ) -> BatchIdsSchema:
+        """
+        The logic of adding books in a single transaction.
+        Nothing is written if any of the books is invalid.
+        :param transaction: Database transaction.
+        :param books_data: List of Pydantic models representing book data.
+        :return: Pydantic model representing the created books IDs.
+        """
+        async with transaction:
+            author_ids = await transaction.users_repo.find_existing_ids(
+                [book.author_id for book in books_data],
+            )
+            genre_ids = await transaction.genres_repo.find_ids_by_names(
+                list({name for book in books_data for name in book.genres}),
+            )
+
+            errors = []
+            for index, book in enumerate(books_data):
+                if book.author_id not in author_ids:
+                    detail = IncorrectAuthorException.detail
+                elif not genre_ids.keys() >= set(book.genres):
+                    detail = IncorrectNamesOfGenreException.detail
+                else:
+                    continue
+                errors.append(
+                    BatchItemErrorSchema(index=index, detail=detail),
+                )
+            if errors:
+                raise BatchValidationException(errors)
+
+            book_ids = await transaction.books_repo.add_many(
+                [book.model_dump(exclude={"genres"}) for book in books_data],
+            )
+            links = [
+                {"book_id": book_id, "genre_id": genre_ids[name]}
+                for book_id, book in zip(book_ids, books_data)
+                for name in set(book.genres)
+            ]
+            if links:
+                await transaction.books_repo.add_genres(links)
+            await transaction.commit()
+        await books_filters_cache.invalidate()
+        await table_versions.bump("books")
+        return BatchIdsSchema(ids=book_ids)
 
     @staticmethod
     async def update_book(
@@ -103,11 +252,14 @@ class BooksService:
                 )
                 book.genres = genres
                 await transaction.commit()
-                return BookIdSchema(book_id=book_id)
         except NoResultFound:
             raise BookWasNotFoundException
         except IntegrityError:
             raise IncorrectAuthorException
+        await book_cache.invalidate(book_id)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("books")
+        return BookIdSchema(book_id=book_id)
 
     @staticmethod
     async def delete_book(
@@ -132,27 +284,175 @@ class BooksService:
                 obj_id=book_id,
             )
             await transaction.commit()
+        await book_cache.invalidate(book_id)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("books")
 
-    @staticmethod
+    @classmethod
     async def get_books_by_filters(
+        cls,
         transaction: BaseManager,
         filters: BookFiltersSchema,
         genres: list[str] | None,
-    ) -> list[BookSchema | None]:
+        pagination: PaginationParams,
+    ) -> BasePaginationResponse[BookSchema]:
         """
         The logic of getting
         a list of books by filters.
+        Identical concurrent searches share a single search.
         :param transaction: Database transaction.
         :param filters: Pydantic model representing the search filters.
         :param genres: List of genres.
-        :return: List of Pydantic models representing the book.
+        :param pagination: Pagination params.
+        :return: Page of Pydantic models representing the book.
         """
-        async with transaction:
-            books = await transaction.books_repo.find_with_filters(
-                filters.author_name,
-                filters.author_surname,
+        query = cls.get_filters_query(filters, genres, pagination)
+
+        async def find_books() -> tuple[list[BookSchema], TotalSchema | None]:
+            return await cls.find_books_by_filters(
+                transaction,
+                filters,
                 genres,
-                filters.min_price,
-                filters.max_price,
+                pagination,
+                query,
+            )
+
+        books, total = await books_filters_reads.run(
+            (json.dumps(query, sort_keys=True), transaction.read_only),
+            find_books,
+        )
+        paginator = Paginator(
+            items=books,
+            params=pagination,
+            total=total,
+        )
+        return paginator.get_response()
+
+    @staticmethod
+    async def find_books_by_filters(
+        transaction: BaseManager,
+        filters: BookFiltersSchema,
+        genres: list[str] | None,
+        pagination: PaginationParams,
+        query: dict,
+    ) -> tuple[list[BookSchema], TotalSchema | None]:
+        """
+        The logic of searching for a page of books by filters.
+        The IDs of the found books and the total are cached,
+        on a hit the books are read from the books cache
+        and only the missing ones from the database.
+        Results of a replica that may lag behind
+        the last catalogue write are not cached.
+        :param transaction: Database transaction.
+        :param filters: Pydantic model representing the search filters.
+        :param genres: List of genres.
+        :param pagination: Pagination params.
+        :param query: Canonical search query.
+        :return: Page rows fetched with `pagination.limit` and the total.
+        """
+        key, is_cacheable = await books_filters_cache.get_key(
+            query,
+            transaction.read_only,
+        )
+        page = await books_filters_cache.get(key) if key else None
+        if page is None:
+            filters_dict = filters.model_dump()
+            async with transaction:
+                books = await transaction.books_repo.find_with_filters(
+                    **filters_dict,
+                    genres=genres,
+                    limit=pagination.limit,
+                    offset=pagination.offset,
+                    after_id=pagination.after_id,
+                )
+                total = await transaction.books_repo.count_with_filters(
+                    pagination.count_strategy,
+                    **filters_dict,
+                    genres=genres,
+                )
+            if key and is_cacheable:
+                await books_filters_cache.set(
+                    key,
+                    BookIdsPageSchema(
+                        ids=[book.id for book in books],
+                        total=total,
+                    ),
+                )
+                await book_cache.set_many({book.id: book for book in books})
+            return books, total
+
+        cached_books = await book_cache.get_many(page.ids)
+        missing_ids = [
+            book_id for book_id in page.ids
+            if book_id not in cached_books
+        ]
+        if missing_ids:
+            async with transaction:
+                loaded_books = await transaction.books_repo.find_many(
+                    missing_ids,
+                )
+            loaded_books = {book.id: book for book in loaded_books}
+            await book_cache.set_many(loaded_books)
+            cached_books |= loaded_books
+        books = [
+            cached_books[book_id] for book_id in page.ids
+            if book_id in cached_books
+        ]
+        return books, page.total
+
+    @staticmethod
+    def get_filters_query(
+        filters: BookFiltersSchema,
+        genres: list[str] | None,
+        pagination: PaginationParams,
+    ) -> dict:
+        """
+        Building the canonical form of a books search:
+        the filters that do not restrict the search are left out
+        and the genres are deduplicated and sorted,
+        so equivalent searches share a cached result.
+        :param filters: Pydantic model representing the search filters.
+        :param genres: List of genres.
+        :param pagination: Pagination params.
+        :return: Canonical search query.
+        """
+        query = {
+            name: value
+            for name, value in filters.model_dump().items()
+            if value
+        }
+        if genres:
+            query["genres"] = sorted(set(genres))
+        if pagination.after_id is not None:
+            query["after_id"] = pagination.after_id
+        else:
+            query["page"] = pagination.page
+        query["size"] = pagination.size
+        if pagination.count_strategy:
+            query["count"] = pagination.count_strategy.value
+        return query
+
+    @staticmethod
+    async def export_books(
+        transaction: BaseManager,
+        filters: BookFiltersSchema,
+        genres: list[str] | None,
+        export_format: ExportFormat,
+    ) -> AsyncIterator[str]:
+        """
+        The logic of exporting books by filters.
+        The session stays open while the response is streamed.
+        :param transaction: Database transaction.
+        :param filters: Pydantic model representing the search filters.
+        :param genres: List of genres.
+        :param export_format: Export format.
+        :return: Serialized chunks of books.
+        """
+        async with transaction:
+            chunks = transaction.books_repo.stream_with_filters(
+                **filters.model_dump(),
+                genres=genres,
+                chunk_size=settings.export.CHUNK_SIZE,
             )
-            return books
+            async for data in serialize(chunks, export_format):
+                yield data
@@ -3,16 +3,35 @@ from sqlalchemy.exc import (
     NoResultFound,
 )
 
+from src.exceptions.batch import BatchValidationException
 from src.exceptions.genres import (
     DuplicatedGenreException,
     GenreWasNotFoundException,
 )
+from src.schemas.batch import (
+    BatchIdsSchema,
+    BatchItemErrorSchema,
+)
 from src.schemas.genres import (
     AddGenreSchema,
     GenreIdSchema,
     GenreSchema,
     UpdateGenreSchema,
 )
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
+from src.utils.cache import (
+    book_cache,
+    books_filters_cache,
+    genre_cache,
+)
+from src.utils.etags import (
+    make_etag,
+    table_versions,
+)
+from src.utils.pagination import Paginator
 from src.utils.transaction import BaseManager
 
 
@@ -24,31 +43,70 @@ class GenresService:
     ) -> GenreSchema:
         """
         The logic of getting a genre by ID.
+        The genre is read through the cache,
+        the transaction is not opened on a hit.
         :param transaction: Database transaction.
         :param genre_id: Genre ID.
         :return: Pydantic model representing the genre.
         """
-        try:
+        async def load_genre() -> GenreSchema:
             async with transaction:
-                genre = await transaction.genres_repo.find_one(
+                return await transaction.genres_repo.find_one(
                     id=genre_id,
                 )
-                return genre
+
+        try:
+            return await genre_cache.get_or_load(genre_id, load_genre)
         except NoResultFound:
             raise GenreWasNotFoundException
 
+    @staticmethod
+    async def get_all_genres_etag(
+        transaction: BaseManager,
+        pagination: PaginationParams,
+    ) -> str | None:
+        """
+        The logic of getting the ETag of a page of genres
+        from the version of the genres table,
+        without loading the genres.
+        :param transaction: Database transaction.
+        :param pagination: Pagination params.
+        :return: Quoted entity tag or None if it is unavailable.
+        """
+        versions = await table_versions.get(
+            ["genres"],
+            transaction.read_only,
+        )
+        if versions is None:
+            return None
+        return make_etag("genres", *versions, pagination.model_dump_json())
+
     @staticmethod
     async def get_all_genres(
         transaction: BaseManager,
-    ) -> list[GenreSchema]:
+        pagination: PaginationParams,
+    ) -> BasePaginationResponse[GenreSchema]:
         """
         The logic of getting a list of genres.
         :param transaction: Database transaction.
-        :return: List of Pydantic models representing the genre.
+        :param pagination: Pagination params.
+        :return: Page of Pydantic models representing the genre.
         """
         async with transaction:
-            genres = await transaction.genres_repo.find_all()
-            return genres
+            genres = await transaction.genres_repo.find_all(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                after_id=pagination.after_id,
+            )
+            total = await transaction.genres_repo.count_total(
+                pagination.count_strategy,
+            )
+            paginator = Paginator(
+                items=genres,
+                params=pagination,
+                total=total,
+            )
+            return paginator.get_response()
 
     @staticmethod
     async def add_genre(
@@ -68,11 +126,53 @@ class GenresService:
                     genre_data_dict,
                 )
                 await transaction.commit()
-                return GenreIdSchema(
-                    genre_id=genre_id,
+        except IntegrityError:
+            raise DuplicatedGenreException
+        await table_versions.bump("genres")
+        return GenreIdSchema(
+            genre_id=genre_id,
+        )
+
+    @staticmethod
+    async def add_genres(
+        transaction: BaseManager,
+        genres_data: list[AddGenreSchema],
+    ) -> BatchIdsSchema:
+        """
+        The logic of adding genres in a single transaction.
+        Nothing is written if any of the genres is a duplicate.
+        :param transaction: Database transaction.
+        :param genres_data: List of Pydantic models representing genre data.
+        :return: Pydantic model representing the created genres IDs.
+        """
+        names = [genre.name for genre in genres_data]
+        try:
+            async with transaction:
+                existing_names = await transaction.genres_repo.find_ids_by_names(
+                    names,
+                )
+                errors = []
+                seen_names = set(existing_names)
+                for index, name in enumerate(names):
+                    if name in seen_names:
+                        errors.append(
+                            BatchItemErrorSchema(
+                                index=index,
+                                detail=DuplicatedGenreException.detail,
+                            ),
+                        )
+                    seen_names.add(name)
+                if errors:
+                    raise BatchValidationException(errors)
+
+                genre_ids = await transaction.genres_repo.add_many(
+                    [genre.model_dump() for genre in genres_data],
                 )
+                await transaction.commit()
         except IntegrityError:
             raise DuplicatedGenreException
+        await table_versions.bump("genres")
+        return BatchIdsSchema(ids=genre_ids)
 
     @staticmethod
     async def update_genre(
@@ -82,6 +182,9 @@ class GenresService:
     ) -> GenreIdSchema:
         """
         The logic of updating the genre by ID.
+        The genre name is a part of every book of the genre,
+        so the versions of the books of the genre are incremented
+        and the cached books are invalidated too.
         :param transaction: Database transaction.
         :param genre_id: Genre ID
         :param genre_data: Pydantic model representing genre data.
@@ -93,14 +196,22 @@ class GenresService:
                     obj_id=genre_id,
                     data={"name": genre_data.name},
                 )
-                await transaction.commit()
-                return GenreIdSchema(
-                    genre_id=genre_id,
+                book_ids = await transaction.books_repo.find_ids_by_genre(
+                    genre_id,
                 )
+                await transaction.books_repo.touch(book_ids)
+                await transaction.commit()
         except NoResultFound:
             raise GenreWasNotFoundException
         except IntegrityError:
             raise DuplicatedGenreException
+        await genre_cache.invalidate(genre_id)
+        await book_cache.invalidate(*book_ids)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("genres")
+        return GenreIdSchema(
+            genre_id=genre_id,
+        )
 
     @staticmethod
     async def delete_genre(
@@ -109,6 +220,9 @@ class GenresService:
     ) -> None:
         """
         The logic of deleting a genre by ID.
+        The genre is removed from its books,
+        so the versions of the books of the genre are incremented
+        and the cached books are invalidated too.
         :param transaction: Database transaction.
         :param genre_id: Genre ID.
         :return: None.
@@ -121,7 +235,15 @@ class GenresService:
             except NoResultFound:
                 raise GenreWasNotFoundException
 
+            book_ids = await transaction.books_repo.find_ids_by_genre(
+                genre_id,
+            )
+            await transaction.books_repo.touch(book_ids)
             await transaction.genres_repo.delete_one(
                 genre_id,
             )
             await transaction.commit()
+        await genre_cache.invalidate(genre_id)
+        await book_cache.invalidate(*book_ids)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("genres")
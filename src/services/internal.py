@@ -0,0 +1,122 @@
+import os
+
+from src.config.config import settings
+from src.db.database import (
+    engine,
+    replica_engines,
+)
+from src.schemas.metrics import (
+    CacheMetricsSchema,
+    LockMetricsSchema,
+    PoolStatsSchema,
+    SingleFlightStatsSchema,
+)
+from src.utils.cache import (
+    caches,
+    local_cache,
+)
+from src.utils.metrics import (
+    CacheStats,
+    SingleFlightStats,
+    booking_lock_metrics,
+)
+from src.utils.singleflight import single_flights
+
+
+class InternalService:
+    @staticmethod
+    def get_booking_locks(top: int) -> LockMetricsSchema:
+        """
+        The logic of getting the booking lock metrics
+        of the current process.
+        :param top: Number of the most contended books.
+        :return: Pydantic model representing the lock metrics.
+        """
+        return booking_lock_metrics.get_snapshot(
+            settings.bookings.LOCK_MODE,
+            top,
+        )
+
+    @staticmethod
+    def reset_booking_locks() -> None:
+        """
+        The logic of resetting the booking lock metrics
+        of the current process.
+        :return: None.
+        """
+        booking_lock_metrics.reset()
+
+    @staticmethod
+    def get_pools() -> list[PoolStatsSchema]:
+        """
+        The logic of getting the connection pools statistics
+        of the primary and the replicas in the current process.
+        :return: List of Pydantic models representing the pools statistics.
+        """
+        engines = {"primary": engine} | {
+            f"replica-{index}": replica_engine
+            for index, replica_engine in enumerate(replica_engines)
+        }
+        return [
+            PoolStatsSchema(
+                pid=os.getpid(),
+                engine=name,
+                size=pool_engine.pool.size(),
+                checked_out=pool_engine.pool.checkedout(),
+                idle=pool_engine.pool.checkedin(),
+                overflow=max(pool_engine.pool.overflow(), 0),
+                max_overflow=settings.db.MAX_OVERFLOW,
+            )
+            for name, pool_engine in engines.items()
+        ]
+
+    @staticmethod
+    def get_caches() -> CacheMetricsSchema:
+        """
+        The logic of getting the caches counters
+        and the in-process tier size of the current process.
+        :return: Pydantic model representing the cache metrics.
+        """
+        return CacheMetricsSchema(
+            pid=os.getpid(),
+            local_entries=len(local_cache.entries),
+            local_bytes=local_cache.size,
+            local_max_bytes=local_cache.max_bytes,
+            local_active=local_cache.is_active,
+            caches=[
+                cache.stats.get_snapshot(cache.name)
+                for cache in caches
+            ],
+        )
+
+    @staticmethod
+    def reset_caches() -> None:
+        """
+        The logic of resetting the caches counters
+        of the current process.
+        :return: None.
+        """
+        for cache in caches:
+            cache.stats = CacheStats()
+
+    @staticmethod
+    def get_single_flights() -> list[SingleFlightStatsSchema]:
+        """
+        The logic of getting the coalescing counters
+        of the identical concurrent reads in the current process.
+        :return: List of Pydantic models representing the counters.
+        """
+        return [
+            single_flight.stats.get_snapshot(single_flight.name)
+            for single_flight in single_flights
+        ]
+
+    @staticmethod
+    def reset_single_flights() -> None:
+        """
+        The logic of resetting the coalescing counters
+        of the current process.
+        :return: None.
+        """
+        for single_flight in single_flights:
+            single_flight.stats = SingleFlightStats()
@@ -8,12 +8,24 @@ from src.exceptions.users import (
     AvatarFileWasNotFoundException,
     UserWasNotFoundException,
 )
+from src.schemas.batch import BatchIdsSchema
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+)
 from src.schemas.users import (
     UserIdSchema,
     UserInitialsSchema,
     UserSchema,
 )
 from src.config.config import settings
+from src.utils.cache import (
+    book_cache,
+    books_filters_cache,
+    user_cache,
+)
+from src.utils.etags import table_versions
+from src.utils.pagination import Paginator
 from src.utils.transaction import BaseManager
 
 
@@ -25,26 +37,43 @@ class UsersService:
     ) -> UserSchema:
         """
         The logic of getting a user by ID.
+        The user is read through the cache,
+        the transaction is not opened on a hit.
         :param transaction: Database transaction.
         :param user_id: User ID.
         :return: Pydantic model representing the user.
         """
-        try:
+        async def load_user() -> UserSchema:
             async with transaction:
-                user = await transaction.users_repo.find_one(
+                return await transaction.users_repo.find_one(
                     id=user_id,
                 )
-                return user
+
+        try:
+            return await user_cache.get_or_load(user_id, load_user)
         except NoResultFound:
             raise UserWasNotFoundException
 
     @staticmethod
     async def get_all_users(
         transaction: BaseManager,
-    ) -> list[UserSchema]:
+        pagination: PaginationParams,
+    ) -> BasePaginationResponse[UserSchema]:
         async with transaction:
-            users = await transaction.users_repo.find_all()
-            return users
+            users = await transaction.users_repo.find_all(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                after_id=pagination.after_id,
+            )
+            total = await transaction.users_repo.count_total(
+                pagination.count_strategy,
+            )
+            paginator = Paginator(
+                items=users,
+                params=pagination,
+                total=total,
+            )
+            return paginator.get_response()
 
     @staticmethod
     async def add_user(
@@ -65,6 +94,24 @@ class UsersService:
             await transaction.commit()
             return UserIdSchema(user_id=user_id)
 
+    @staticmethod
+    async def add_users(
+        transaction: BaseManager,
+        users_data: list[UserInitialsSchema],
+    ) -> BatchIdsSchema:
+        """
+        The logic of creating users in a single transaction.
+        :param transaction: Database transaction.
+        :param users_data: List of Pydantic models representing user data.
+        :return: Pydantic model representing the created users IDs.
+        """
+        async with transaction:
+            user_ids = await transaction.users_repo.add_many(
+                [user.model_dump() for user in users_data],
+            )
+            await transaction.commit()
+            return BatchIdsSchema(ids=user_ids)
+
     @staticmethod
     async def update_user(
         transaction: BaseManager,
@@ -86,9 +133,11 @@ class UsersService:
                     data=fields_dict,
                 )
                 await transaction.commit()
-                return UserIdSchema(user_id=user_id)
         except NoResultFound:
             raise UserWasNotFoundException
+        await user_cache.invalidate(user_id)
+        await books_filters_cache.invalidate()
+        return UserIdSchema(user_id=user_id)
 
     @staticmethod
     async def delete_user(
@@ -97,6 +146,8 @@ class UsersService:
     ) -> None:
         """
         The logic of deleting a user by ID.
+        The books of the user are deleted with it,
+        so the cached books of the user are invalidated too.
         :param transaction: Database transaction.
         :param user_id: User ID.
         :return: None.
@@ -108,12 +159,19 @@ class UsersService:
                 )
                 if user.avatar_path:
                     os.remove(user.avatar_path)
+                book_ids = await transaction.books_repo.find_ids_by_author(
+                    user_id,
+                )
                 await transaction.users_repo.delete_one(
                     user_id,
                 )
                 await transaction.commit()
         except NoResultFound:
             raise UserWasNotFoundException
+        await user_cache.invalidate(user_id)
+        await book_cache.invalidate(*book_ids)
+        await books_filters_cache.invalidate()
+        await table_versions.bump("books")
 
     @staticmethod
     async def upload_avatar(
@@ -147,7 +205,8 @@ class UsersService:
                     data={"avatar_path": avatar_path},
                 )
                 await transaction.commit()
-                return UserIdSchema(user_id=user_id)
+        await user_cache.invalidate(user_id)
+        return UserIdSchema(user_id=user_id)
 
     @staticmethod
     async def delete_avatar(
@@ -181,3 +240,4 @@ class UsersService:
                     raise AvatarFileIsNotLoadedException
         except NoResultFound:
             raise UserWasNotFoundException
+        await user_cache.invalidate(user_id)
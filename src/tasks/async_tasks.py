@@ -1,16 +1,192 @@
 import datetime
+import logging
+import time
+from typing import Callable
 
-from src.utils.transaction import TransactionManager
+from src.config.config import settings
+from src.db.partitions import (
+    create_partitions,
+    drop_expired_partitions,
+)
+from src.schemas.books import BookSchema
+from src.schemas.imports import (
+    BooksImportStatsSchema,
+    ImportFormat,
+)
+from src.tasks.runtime import runtime
+from src.utils.cache import (
+    BookFiltersCache,
+    EntityCache,
+)
+from src.utils.etags import TableVersions
+from src.utils.expiry import BookingExpiry
+from src.utils.importer import read_books_feed
 
+logger = logging.getLogger(__name__)
 
-async def remove_book_reservation() -> None:
+
+async def drop_booking_partitions() -> None:
+    """
+    The logic of dropping (or archiving) the bookings partitions
+    of the ended months.
+    :return: None.
+    """
+    async with runtime.engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        expired = await drop_expired_partitions(
+            connection,
+            datetime.date.today(),
+            settings.bookings.PARTITIONS_ARCHIVE,
+        )
+    if expired:
+        logger.info("Expired bookings partitions: %s", ", ".join(expired))
+
+
+async def release_expired_bookings() -> None:
+    """
+    The logic of deleting the bookings
+    whose scheduled expiry time has come.
+    Bookings are claimed from the schedule and deleted in batches,
+    each batch is committed in its own transaction.
+    :return: None.
+    """
+    batch_size = settings.bookings.EXPIRY_BATCH_SIZE
+    released = 0
+    expiry = BookingExpiry(runtime.redis)
+    while True:
+        now = datetime.datetime.now()
+        booking_ids = await expiry.claim(now, batch_size)
+        if booking_ids:
+            async with runtime.get_transaction() as transaction:
+                deleted = await transaction.bookings_repo.delete_expired(
+                    booking_ids,
+                    now,
+                )
+                await transaction.commit()
+            released += len(deleted)
+        if len(booking_ids) < batch_size:
+            break
+    if released:
+        logger.info("Expired bookings released: %d rows", released)
+
+
+async def reconcile_booking_expiry() -> None:
+    """
+    The logic of reconciling the bookings expiry schedule
+    with the database: expired bookings missed by the schedule
+    are deleted in batches, each batch is committed
+    in its own transaction, and the bookings expiring soon
+    are scheduled again.
+    :return: None.
+    """
+    now = datetime.datetime.now()
+    batch_size = settings.bookings.EXPIRY_BATCH_SIZE
+    removed = 0
+    started = time.perf_counter()
+    while True:
+        async with runtime.get_transaction() as transaction:
+            deleted = await transaction.bookings_repo.remove_old_bookings(
+                now,
+                batch_size,
+            )
+            await transaction.commit()
+        removed += deleted
+        if deleted < batch_size:
+            break
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Expired bookings removal: %d rows in %.2f s, %.0f rows/s",
+        removed,
+        elapsed,
+        removed / elapsed,
+    )
+
+    until = now + datetime.timedelta(
+        hours=settings.bookings.EXPIRY_RECONCILE_HOURS,
+    )
+    expiry = BookingExpiry(runtime.redis)
+    async with runtime.get_transaction() as transaction:
+        chunks = transaction.bookings_repo.stream_expiring(
+            now,
+            until,
+            chunk_size=batch_size,
+        )
+        async for chunk in chunks:
+            await expiry.schedule(
+                {booking.id: booking.date_to for booking in chunk},
+            )
+
+
+async def create_booking_partitions() -> None:
     """
-    The logic of deleting expiring bookings.
+    The logic of creating the bookings partitions
+    of the current month and the months ahead of it.
     :return: None.
     """
-    current_date = datetime.date.today()
-    async with TransactionManager() as transaction:
-        await transaction.bookings_repo.remove_old_bookings(
-            current_date,
+    async with runtime.engine.begin() as connection:
+        created = await create_partitions(
+            connection,
+            datetime.date.today(),
+            settings.bookings.PARTITIONS_AHEAD,
+        )
+    if created:
+        logger.info("Created bookings partitions: %s", ", ".join(created))
+
+
+async def import_books(
+    path: str,
+    file_format: ImportFormat,
+    on_progress: Callable[[BooksImportStatsSchema], None] | None = None,
+) -> BooksImportStatsSchema:
+    """
+    The logic of importing a books feed.
+    The file is read lazily and every chunk
+    is loaded and committed in its own transaction,
+    the cached books and search results changed by the chunk
+    are invalidated.
+    :param path: Path to the feed file.
+    :param file_format: Feed format.
+    :param on_progress: Callback receiving a copy of the statistics
+                        after each chunk.
+    :return: Pydantic model representing the import statistics.
+    """
+    stats = BooksImportStatsSchema()
+    book_cache = EntityCache(runtime.redis, "books", BookSchema)
+    books_filters_cache = BookFiltersCache(runtime.redis)
+    table_versions = TableVersions(runtime.redis)
+    started = time.perf_counter()
+    chunks = read_books_feed(
+        path,
+        file_format,
+        settings.importer.CHUNK_SIZE,
+    )
+    for chunk in chunks:
+        records = [record for record in chunk if record is not None]
+        stats.invalid += len(chunk) - len(records)
+        if records:
+            async with runtime.get_transaction() as transaction:
+                chunk_stats, changed_ids = (
+                    await transaction.books_repo.import_chunk(records)
+                )
+                await transaction.commit()
+            await book_cache.invalidate(*changed_ids)
+            if changed_ids or chunk_stats.inserted:
+                await books_filters_cache.invalidate()
+                await table_versions.bump("books")
+            stats.rows += chunk_stats.rows
+            stats.skipped += chunk_stats.skipped
+            stats.inserted += chunk_stats.inserted
+            stats.updated += chunk_stats.updated
+
+        stats.elapsed = time.perf_counter() - started
+        stats.rows_per_second = (stats.rows + stats.invalid) / stats.elapsed
+        logger.info(
+            "Books import %s: %d rows, %.0f rows/s",
+            path,
+            stats.rows + stats.invalid,
+            stats.rows_per_second,
         )
-        await transaction.commit()
+        if on_progress:
+            on_progress(stats.model_copy())
+    return stats
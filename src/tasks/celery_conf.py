@@ -7,12 +7,26 @@ from src.config.config import settings
 celery_app = Celery(
     "tasks",
     broker=f"redis://{settings.redis.HOST}:{settings.redis.PORT}",
+    backend=f"redis://{settings.redis.HOST}:{settings.redis.PORT}",
     include=["src.tasks.tasks"],
 )
 
 celery_app.conf.beat_schedule = {
-    "refresh_car_location": {
-        "task": "remove_book_reservation",
+    "release_expired_bookings": {
+        "task": "release_expired_bookings",
+        "schedule": settings.bookings.EXPIRY_POLL_SECONDS,
+        "options": {"expires": settings.bookings.EXPIRY_POLL_SECONDS},
+    },
+    "reconcile_booking_expiry": {
+        "task": "reconcile_booking_expiry",
+        "schedule": crontab(minute="30"),
+    },
+    "drop_booking_partitions": {
+        "task": "drop_booking_partitions",
         "schedule": crontab(hour="0", minute="0"),
-    }
+    },
+    "create_booking_partitions": {
+        "task": "create_booking_partitions",
+        "schedule": crontab(hour="23", minute="0"),
+    },
 }
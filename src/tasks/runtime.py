@@ -0,0 +1,135 @@
+import asyncio
+import queue
+import threading
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    TypeVar,
+)
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+)
+
+from src.db.database import create_engine
+from src.db.redis import get_redis_client
+from src.utils.transaction import TransactionManager
+
+T = TypeVar("T")
+
+DONE = object()
+
+
+class WorkerRuntime:
+    def __init__(self):
+        """
+        Initialization the async runtime of a worker process:
+        an event loop running in a background thread
+        with its own connection pools.
+        """
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.engine: AsyncEngine | None = None
+        self.session_maker: async_sessionmaker | None = None
+        self.redis: Redis | None = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starting the event loop and creating the connection pools.
+        The pools are created in the worker process,
+        so they are never shared with the parent process.
+        :return: None.
+        """
+        with self.lock:
+            if self.loop is not None:
+                return
+            self.engine = create_engine()
+            self.session_maker = async_sessionmaker(
+                self.engine,
+                expire_on_commit=False,
+            )
+            self.redis = get_redis_client()
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(
+                target=self.loop.run_forever,
+                name="worker-runtime",
+                daemon=True,
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Closing the connection pools and stopping the event loop.
+        :return: None.
+        """
+        with self.lock:
+            if self.loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(
+                self.close_pools(),
+                self.loop,
+            ).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = None
+            self.thread = None
+
+    async def close_pools(self) -> None:
+        """
+        Closing the database and Redis connections.
+        :return: None.
+        """
+        await self.engine.dispose()
+        await self.redis.aclose()
+
+    def run(self, coroutine: Coroutine[None, None, T]) -> T:
+        """
+        Running a coroutine on the event loop of the worker
+        and waiting for its result.
+        The runtime is started on the first call
+        if the worker pool does not start it.
+        :param coroutine: Coroutine.
+        :return: Coroutine result.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        return future.result()
+
+    def run_with_updates(
+        self,
+        coroutine: Coroutine[None, None, T],
+        updates: queue.SimpleQueue,
+        on_update: Callable[[Any], None],
+    ) -> T:
+        """
+        Running a coroutine on the event loop of the worker
+        and handling the updates it puts into the queue
+        on the calling thread until it finishes,
+        so blocking handlers do not stall the event loop.
+        :param coroutine: Coroutine.
+        :param updates: Queue the coroutine puts its updates into.
+        :param on_update: Update handler.
+        :return: Coroutine result.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(lambda _: updates.put(DONE))
+        while (update := updates.get()) is not DONE:
+            on_update(update)
+        return future.result()
+
+    def get_transaction(self) -> TransactionManager:
+        """
+        Getting a transaction manager
+        using the connection pool of the worker.
+        :return: Transaction manager.
+        """
+        return TransactionManager(self.session_maker)
+
+
+runtime = WorkerRuntime()
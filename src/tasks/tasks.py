@@ -1,13 +1,104 @@
-import asyncio
+import queue
 
-from src.tasks.async_tasks import remove_book_reservation
+from celery.signals import (
+    worker_process_init,
+    worker_process_shutdown,
+)
+
+from src.schemas.imports import ImportFormat
+from src.tasks.async_tasks import (
+    create_booking_partitions,
+    drop_booking_partitions,
+    import_books,
+    reconcile_booking_expiry,
+    release_expired_bookings,
+)
 from src.tasks.celery_conf import celery_app
+from src.tasks.runtime import runtime
+
+
+@worker_process_init.connect
+def start_runtime(**kwargs) -> None:
+    """
+    Starting the async runtime of a worker process.
+    :return: None.
+    """
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def stop_runtime(**kwargs) -> None:
+    """
+    Stopping the async runtime of a worker process.
+    :return: None.
+    """
+    runtime.stop()
+
+
+@celery_app.task(name="release_expired_bookings")
+def release_expired_bookings_task() -> None:
+    """
+    Starting the release of the expired bookings.
+    :return: None.
+    """
+    runtime.run(release_expired_bookings())
+
+
+@celery_app.task(name="reconcile_booking_expiry")
+def reconcile_booking_expiry_task() -> None:
+    """
+    Starting the reconciliation of the bookings expiry schedule.
+    :return: None.
+    """
+    runtime.run(reconcile_booking_expiry())
 
 
-@celery_app.task(name="remove_book_reservation")
-def refresh_car_location_task() -> None:
+@celery_app.task(name="drop_booking_partitions")
+def drop_booking_partitions_task() -> None:
     """
-    Starting an asynchronous task
+    Starting the removal of the expired bookings partitions.
     :return: None.
     """
-    asyncio.run(remove_book_reservation())
+    runtime.run(drop_booking_partitions())
+
+
+@celery_app.task(name="create_booking_partitions")
+def create_booking_partitions_task() -> None:
+    """
+    Starting the creation of the bookings partitions.
+    :return: None.
+    """
+    runtime.run(create_booking_partitions())
+
+
+@celery_app.task(name="import_books", bind=True)
+def import_books_task(
+    self,
+    path: str,
+    file_format: str = ImportFormat.JSONL.value,
+) -> dict:
+    """
+    Starting the books feed import.
+    The statistics are published as the PROGRESS task state
+    from the worker thread: the task context is not available
+    on the event loop thread and the result backend write blocks.
+    :param path: Path to the feed file available to the worker.
+    :param file_format: Feed format.
+    :return: Import statistics.
+    """
+    task_id = self.request.id
+    progress = queue.SimpleQueue()
+    stats = runtime.run_with_updates(
+        import_books(
+            path,
+            ImportFormat(file_format),
+            on_progress=progress.put,
+        ),
+        progress,
+        lambda update: self.update_state(
+            task_id=task_id,
+            state="PROGRESS",
+            meta=update.model_dump(),
+        ),
+    )
+    return stats.model_dump()
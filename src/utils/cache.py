@@ -0,0 +1,474 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config.config import settings
+from src.db.redis import redis_client
+from src.schemas.books import (
+    BookIdsPageSchema,
+    BookSchema,
+)
+from src.schemas.genres import GenreSchema
+from src.schemas.users import UserSchema
+from src.utils.metrics import CacheStats
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# An invalidated key holds an empty tombstone for a few seconds:
+# it reads as a miss, but the value loaded by a concurrent read
+# that started before the write (or from a lagging replica)
+# is not stored over it.
+TOMBSTONE = ""
+
+# Invalidated keys are published as a JSON list,
+# every API worker drops them from its in-process tier.
+INVALIDATION_CHANNEL = "cache:invalidation"
+CATALOG_VERSION_KEY = "cache:catalog:version"
+# Exists for the read-your-writes window after a catalogue version bump,
+# while replicas may not show the write yet.
+CATALOG_CHANGED_KEY = "cache:catalog:changed"
+RESUBSCRIBE_SECONDS = 1
+
+logger = logging.getLogger(__name__)
+
+
+def get_schema_fingerprint(schema: type[BaseModel]) -> str:
+    """
+    Getting a short hash of the JSON schema of a Pydantic model.
+    It is a part of the cache keys, so the objects cached
+    by a previous release with another schema are never read.
+    :param schema: Pydantic model.
+    :return: Fingerprint.
+    """
+    return hashlib.sha256(
+        json.dumps(schema.model_json_schema(), sort_keys=True).encode(),
+    ).hexdigest()[:8]
+
+
+class LocalCache:
+    def __init__(self, max_bytes: int, ttl: float):
+        """
+        Initialization the in-process LRU cache of a worker.
+        Entries are stored serialized, so the size of the cache
+        is the size of the UTF-8 encoded values and cached objects
+        cannot be changed by their callers.
+        The cache is only used while the worker is subscribed
+        to the invalidation channel.
+        :param max_bytes: Maximum total size of the entries.
+        :param ttl: Lifetime of the entries in seconds.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.is_active = False
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Getting an entry and marking it as recently used.
+        :param key: Key.
+        :return: Serialized object or None on a miss.
+        """
+        if not self.is_active:
+            return None
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, generation: int) -> None:
+        """
+        Storing an entry and evicting the least recently used ones
+        until the cache fits into its size.
+        The entry is skipped if anything was invalidated
+        since its loading started.
+        :param key: Key.
+        :param value: Serialized object.
+        :param generation: Generation read before the loading.
+        :return: None.
+        """
+        if (
+            not self.is_active
+            or generation != self.generation
+            or len(value) > self.max_bytes
+        ):
+            return
+        self.delete(key)
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def delete(self, *keys: str) -> None:
+        """
+        Deleting entries.
+        :param keys: Keys.
+        :return: None.
+        """
+        self.generation += 1
+        for key in keys:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.size -= len(entry[1])
+
+    def clear(self) -> None:
+        """
+        Deleting all the entries.
+        :return: None.
+        """
+        self.generation += 1
+        self.entries.clear()
+        self.size = 0
+
+
+class EntityCache(Generic[SchemaT]):
+    def __init__(
+        self,
+        client: Redis,
+        name: str,
+        schema: type[SchemaT],
+        local: LocalCache | None = None,
+        ttl: int = settings.cache.TTL_SECONDS,
+        invalidation_ttl: int = settings.cache.INVALIDATION_SECONDS,
+    ):
+        """
+        Initialization the read-through cache of an entity:
+        the in-process tier, if any, in front of Redis.
+        Redis errors are logged and treated as misses,
+        so the cache never fails a request.
+        :param client: Redis client.
+        :param name: Entity name, the prefix of the keys.
+        :param schema: Pydantic model of the cached objects.
+        :param local: In-process tier.
+        :param ttl: Lifetime of the cached objects in seconds.
+        :param invalidation_ttl: Lifetime of the tombstones in seconds.
+        """
+        self.client = client
+        self.name = name
+        self.schema = schema
+        self.prefix = f"cache:{name}:{get_schema_fingerprint(schema)}"
+        self.local = local
+        self.ttl = ttl
+        self.invalidation_ttl = invalidation_ttl
+        self.stats = CacheStats()
+
+    def get_key(self, obj_id: int) -> str:
+        """
+        Getting the key of a cached object.
+        :param obj_id: Object ID.
+        :return: Key.
+        """
+        return f"{self.prefix}:{obj_id}"
+
+    async def get(self, key: str) -> str | None:
+        """
+        Getting a serialized object from Redis.
+        :param key: Key.
+        :return: Serialized object or None on a miss.
+        """
+        try:
+            value = await self.client.get(key)
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+            return None
+        if not value:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Storing a serialized object in Redis
+        unless its key was just invalidated.
+        :param key: Key.
+        :param value: Serialized object.
+        :return: None.
+        """
+        try:
+            await self.client.set(key, value, ex=self.ttl, nx=True)
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+
+    async def get_or_load(
+        self,
+        obj_id: int,
+        load: Callable[[], Awaitable[SchemaT]],
+    ) -> SchemaT:
+        """
+        Getting a cached object from the in-process tier or Redis,
+        or loading and storing it on a miss.
+        :param obj_id: Object ID.
+        :param load: Coroutine function loading the object.
+        :return: Pydantic model.
+        """
+        key = self.get_key(obj_id)
+        if self.local:
+            local_value = self.local.get(key)
+            if local_value is not None:
+                self.stats.local_hits += 1
+                return self.schema.model_validate_json(local_value)
+            generation = self.local.generation
+
+        value = await self.get(key)
+        if value:
+            obj = self.schema.model_validate_json(value)
+        else:
+            obj = await load()
+            value = obj.model_dump_json()
+            await self.set(key, value)
+        if self.local:
+            self.local.set(key, value.encode(), generation)
+        return obj
+
+    async def get_many(self, obj_ids: list[int]) -> dict[int, SchemaT]:
+        """
+        Getting cached objects from the in-process tier
+        and the rest of them from Redis with a single MGET.
+        :param obj_ids: Objects IDs.
+        :return: Pydantic models by IDs, the misses are left out.
+        """
+        found = {}
+        keys = {}
+        for obj_id in obj_ids:
+            key = self.get_key(obj_id)
+            local_value = self.local.get(key) if self.local else None
+            if local_value is None:
+                keys[obj_id] = key
+            else:
+                self.stats.local_hits += 1
+                found[obj_id] = self.schema.model_validate_json(local_value)
+        if not keys:
+            return found
+
+        generation = self.local.generation if self.local else 0
+        try:
+            values = await self.client.mget(list(keys.values()))
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+            return found
+        for (obj_id, key), value in zip(keys.items(), values):
+            if not value:
+                self.stats.misses += 1
+                continue
+            self.stats.hits += 1
+            found[obj_id] = self.schema.model_validate_json(value)
+            if self.local:
+                self.local.set(key, value.encode(), generation)
+        return found
+
+    async def set_many(self, objs: dict[int, SchemaT]) -> None:
+        """
+        Storing objects in Redis with a single round trip,
+        skipping the keys that were just invalidated.
+        :param objs: Pydantic models by IDs.
+        :return: None.
+        """
+        if not objs:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for obj_id, obj in objs.items():
+                    pipeline.set(
+                        self.get_key(obj_id),
+                        obj.model_dump_json(),
+                        ex=self.ttl,
+                        nx=True,
+                    )
+                await pipeline.execute()
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+
+    async def invalidate(self, *obj_ids: int) -> None:
+        """
+        Invalidating cached objects after their changes are committed
+        and notifying the workers to drop them from their
+        in-process tiers. Objects left stale while Redis
+        is unavailable expire with their TTL.
+        :param obj_ids: Objects IDs.
+        :return: None.
+        """
+        if not obj_ids:
+            return
+        keys = [self.get_key(obj_id) for obj_id in obj_ids]
+        if self.local:
+            self.local.delete(*keys)
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.set(key, TOMBSTONE, ex=self.invalidation_ttl)
+                pipeline.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+                await pipeline.execute()
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+
+
+class BookFiltersCache:
+    def __init__(
+        self,
+        client: Redis,
+        ttl: int = settings.cache.FILTERS_TTL_SECONDS,
+    ):
+        """
+        Initialization the cache of the books search results.
+        A result is the list of the found books IDs and the total,
+        the books themselves are read from the books cache.
+        Results are keyed by the catalogue version,
+        so a book, genre or author write invalidates all of them
+        by bumping it.
+        :param client: Redis client.
+        :param ttl: Lifetime of the results in seconds.
+        """
+        self.client = client
+        self.name = "books-filters"
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    async def get_key(
+        self,
+        query: dict,
+        read_only: bool,
+    ) -> tuple[str | None, bool]:
+        """
+        Getting the key of a search result
+        in the current catalogue version.
+        A result read from a replica within the read-your-writes window
+        after the version was bumped may miss the write,
+        so it is not stored under the new version.
+        :param query: Canonical search query.
+        :param read_only: Whether the search reads from a replica.
+        :return: Key or None if the cache is unavailable
+                 and whether the search result may be stored.
+        """
+        try:
+            version, changed = await self.client.mget(
+                [CATALOG_VERSION_KEY, CATALOG_CHANGED_KEY],
+            )
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+            return None, False
+        digest = hashlib.sha256(
+            json.dumps(query, sort_keys=True).encode(),
+        ).hexdigest()
+        is_lagging = read_only and bool(settings.db.REPLICA_HOSTS) and changed
+        return (
+            f"cache:{self.name}:{version or 0}:{digest}",
+            not is_lagging,
+        )
+
+    async def get(self, key: str) -> BookIdsPageSchema | None:
+        """
+        Getting a search result.
+        :param key: Key.
+        :return: Pydantic model or None on a miss.
+        """
+        try:
+            value = await self.client.get(key)
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+            return None
+        if not value:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return BookIdsPageSchema.model_validate_json(value)
+
+    async def set(self, key: str, page: BookIdsPageSchema) -> None:
+        """
+        Storing a search result.
+        :param key: Key.
+        :param page: Pydantic model representing the search result.
+        :return: None.
+        """
+        try:
+            await self.client.set(key, page.model_dump_json(), ex=self.ttl)
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+
+    async def invalidate(self) -> None:
+        """
+        Invalidating all the search results by bumping
+        the catalogue version after a write is committed.
+        Results left stale while Redis is unavailable
+        expire with their TTL.
+        :return: None.
+        """
+        try:
+            async with self.client.pipeline(transaction=True) as pipeline:
+                pipeline.incr(CATALOG_VERSION_KEY)
+                if settings.db.READ_YOUR_WRITES_SECONDS:
+                    pipeline.set(
+                        CATALOG_CHANGED_KEY,
+                        1,
+                        ex=settings.db.READ_YOUR_WRITES_SECONDS,
+                    )
+                await pipeline.execute()
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Cache %s is unavailable", self.name, exc_info=True)
+
+
+async def listen_invalidations(client: Redis, local: LocalCache) -> None:
+    """
+    Dropping the keys published to the invalidation channel
+    from the in-process tier of the worker.
+    Invalidations may be missed while the worker is not subscribed,
+    so the tier is disabled until the subscription is restored
+    and is cleared then.
+    :param client: Redis client.
+    :param local: In-process tier.
+    :return: None.
+    """
+    while True:
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                local.clear()
+                local.is_active = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        local.delete(*json.loads(message["data"]))
+        except RedisError:
+            logger.warning("Cache invalidations are unavailable", exc_info=True)
+        finally:
+            local.is_active = False
+        await asyncio.sleep(RESUBSCRIBE_SECONDS)
+
+
+local_cache = LocalCache(
+    settings.cache.LOCAL_MAX_BYTES,
+    settings.cache.LOCAL_TTL_SECONDS,
+)
+book_cache = EntityCache(redis_client, "books", BookSchema, local_cache)
+genre_cache = EntityCache(redis_client, "genres", GenreSchema, local_cache)
+user_cache = EntityCache(redis_client, "users", UserSchema, local_cache)
+books_filters_cache = BookFiltersCache(redis_client)
+caches = [book_cache, genre_cache, user_cache, books_filters_cache]
@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import secrets
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config.config import settings
+from src.db.redis import redis_client
+
+TABLE_VERSION_KEY = "versions:{table}"
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Building a strong ETag from the parts
+    that identify a representation.
+    :param parts: Representation parts.
+    :return: Quoted entity tag.
+    """
+    digest = hashlib.sha256(
+        "|".join(str(part) for part in parts).encode(),
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def get_row_etag(table: str, obj_id: int, version: int) -> str:
+    """
+    Building the ETag of a row from its version.
+    :param table: Table name.
+    :param obj_id: Row ID.
+    :param version: Row version.
+    :return: Quoted entity tag.
+    """
+    return make_etag(table, obj_id, version)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Checking the `If-None-Match` header against an ETag
+    with the weak comparison required for it.
+    :param if_none_match: Header value.
+    :param etag: Current entity tag.
+    :return: Whether the client representation is current.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def new_table_version() -> str:
+    """
+    Generating a table version that is never repeated,
+    even after Redis loses the previous ones:
+    the time of the write in milliseconds and a random suffix.
+    :return: Table version.
+    """
+    return f"{time.time_ns() // 1_000_000}.{secrets.token_hex(4)}"
+
+
+class TableVersions:
+    def __init__(
+        self,
+        client: Redis,
+        ttl: int = settings.cache.VERSIONS_TTL_SECONDS,
+    ):
+        """
+        Initialization the table versions: tokens replaced
+        after every committed write to a table.
+        Redis errors are logged and leave the responses without ETags.
+        The tokens expire, so a token left in place
+        by a failed replacement is only used until its TTL.
+        :param client: Redis client.
+        :param ttl: Lifetime of the tokens in seconds.
+        """
+        self.client = client
+        self.ttl = ttl
+
+    async def get(
+        self,
+        tables: list[str],
+        read_only: bool,
+    ) -> list[str] | None:
+        """
+        Getting the versions of tables, creating the missing ones.
+        A replica may not show a write yet for the read-your-writes
+        window after it, so no versions are given to a replica read
+        within it.
+        :param tables: Tables names.
+        :param read_only: Whether the tables are read from a replica.
+        :return: Tables versions or None if they are unavailable.
+        """
+        keys = [TABLE_VERSION_KEY.format(table=table) for table in tables]
+        try:
+            versions = await self.client.mget(keys)
+            if None in versions:
+                async with self.client.pipeline(transaction=False) as pipeline:
+                    for key, version in zip(keys, versions):
+                        if version is None:
+                            pipeline.set(
+                                key,
+                                new_table_version(),
+                                nx=True,
+                                ex=self.ttl,
+                            )
+                    await pipeline.execute()
+                versions = await self.client.mget(keys)
+        except RedisError:
+            logger.warning("Table versions are unavailable", exc_info=True)
+            return None
+
+        if read_only and settings.db.REPLICA_HOSTS:
+            lag_ms = settings.db.READ_YOUR_WRITES_SECONDS * 1000
+            now_ms = time.time_ns() // 1_000_000
+            if any(
+                now_ms - int(version.split(".")[0]) < lag_ms
+                for version in versions
+            ):
+                return None
+        return versions
+
+    async def bump(self, *tables: str) -> None:
+        """
+        Replacing the versions of tables after a write is committed.
+        :param tables: Tables names.
+        :return: None.
+        """
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for table in tables:
+                    pipeline.set(
+                        TABLE_VERSION_KEY.format(table=table),
+                        new_table_version(),
+                        ex=self.ttl,
+                    )
+                await pipeline.execute()
+        except RedisError:
+            logger.warning("Table versions are unavailable", exc_info=True)
+
+
+table_versions = TableVersions(redis_client)
@@ -0,0 +1,98 @@
+from datetime import (
+    date,
+    datetime,
+    time,
+    timedelta,
+)
+
+from redis.asyncio import Redis
+
+from src.db.redis import redis_client
+
+EXPIRY_KEY = "bookings:expiry"
+
+# Booking periods include the end date,
+# so a booking expires at the end of its last day.
+LAST_DAY = timedelta(days=1)
+
+# Expired bookings are removed from the schedule by the same script
+# that reads them, so concurrent pollers never claim the same booking.
+CLAIM_EXPIRED_SCRIPT = """
+local ids = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]
+)
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+
+def get_expires_at(date_to: date | datetime) -> float:
+    """
+    Getting the expiry time of a booking: the end of its end date.
+    :param date_to: Booking end date.
+    :return: POSIX timestamp.
+    """
+    if not isinstance(date_to, datetime):
+        date_to = datetime.combine(date_to, time.min)
+    return (date_to + LAST_DAY).timestamp()
+
+
+def get_expired_until(now: datetime) -> datetime:
+    """
+    Getting the latest end date of the bookings expired at a time.
+    :param now: Current time.
+    :return: Booking end date.
+    """
+    return now - LAST_DAY
+
+
+class BookingExpiry:
+    def __init__(self, client: Redis):
+        """
+        Initialization the bookings expiry schedule.
+        :param client: Redis client.
+        """
+        self.client = client
+        self.claim_script = client.register_script(CLAIM_EXPIRED_SCRIPT)
+
+    async def schedule(self, expirations: dict[int, date | datetime]) -> None:
+        """
+        Scheduling the expiry of bookings
+        or moving it if they are already scheduled.
+        :param expirations: Bookings end dates by bookings IDs.
+        :return: None.
+        """
+        if expirations:
+            await self.client.zadd(
+                EXPIRY_KEY,
+                {
+                    booking_id: get_expires_at(date_to)
+                    for booking_id, date_to in expirations.items()
+                },
+            )
+
+    async def unschedule(self, booking_id: int) -> None:
+        """
+        Removing a booking from the expiry schedule.
+        :param booking_id: Booking ID.
+        :return: None.
+        """
+        await self.client.zrem(EXPIRY_KEY, booking_id)
+
+    async def claim(self, now: datetime, limit: int) -> list[int]:
+        """
+        Taking the expired bookings off the schedule.
+        :param now: Current time.
+        :param limit: Maximum number of bookings.
+        :return: Expired bookings IDs.
+        """
+        booking_ids = await self.claim_script(
+            keys=[EXPIRY_KEY],
+            args=[now.timestamp(), limit],
+        )
+        return [int(booking_id) for booking_id in booking_ids]
+
+
+booking_expiry = BookingExpiry(redis_client)
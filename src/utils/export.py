@@ -0,0 +1,65 @@
+import csv
+import io
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+
+from src.schemas.export import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+LIST_SEPARATOR = "|"
+
+
+def to_ndjson(chunk: list[BaseModel]) -> str:
+    """
+    Serializing a chunk of models to NDJSON.
+    :param chunk: List of Pydantic models.
+    :return: One JSON document per line.
+    """
+    return "".join(row.model_dump_json() + "\n" for row in chunk)
+
+
+def to_csv(
+    chunk: list[BaseModel],
+    header: bool = False,
+) -> str:
+    """
+    Serializing a chunk of models to CSV.
+    List values are joined with `LIST_SEPARATOR`.
+    :param chunk: List of Pydantic models.
+    :param header: Whether to write the header row.
+    :return: CSV rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header and chunk:
+        writer.writerow(type(chunk[0]).model_fields)
+    for row in chunk:
+        writer.writerow(
+            LIST_SEPARATOR.join(map(str, value))
+            if isinstance(value, list) else value
+            for value in row.model_dump(mode="json").values()
+        )
+    return buffer.getvalue()
+
+
+async def serialize(
+    chunks: AsyncIterator[list[BaseModel]],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """
+    Serializing chunks of models in the export format.
+    :param chunks: Chunks of Pydantic models.
+    :param export_format: Export format.
+    :return: Serialized chunks.
+    """
+    is_first = True
+    async for chunk in chunks:
+        if export_format == ExportFormat.CSV:
+            yield to_csv(chunk, header=is_first)
+        else:
+            yield to_ndjson(chunk)
+        is_first = False
@@ -0,0 +1,183 @@
+from datetime import date
+from typing import Sequence
+
+from redis.asyncio import Redis
+
+from src.db.redis import redis_client
+
+# Holds of a book are members of a sorted set scored by the expiry time
+# in milliseconds: "<hold_id>:<user_id>:<date_from>:<date_to>" with
+# the dates as ordinals. The scripts drop the expired holds first,
+# holds of the same user never conflict with each other.
+HOLD_FUNCTIONS = """
+local function now_ms()
+    local now = redis.call('TIME')
+    return tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+end
+
+local function find_holds(key, user_id, date_from, date_to, own)
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms())
+    local found = {}
+    for _, member in ipairs(redis.call('ZRANGE', key, 0, -1)) do
+        local hold_user, hold_from, hold_to = string.match(
+            member, '^[^:]+:([^:]+):(%d+):(%d+)$'
+        )
+        if (hold_user == user_id) == own
+            and tonumber(hold_from) <= date_to
+            and date_from <= tonumber(hold_to) then
+            table.insert(found, member)
+        end
+    end
+    return found
+end
+"""
+
+PLACE_HOLD_SCRIPT = HOLD_FUNCTIONS + """
+local date_from, date_to = tonumber(ARGV[3]), tonumber(ARGV[4])
+if #find_holds(KEYS[1], ARGV[2], date_from, date_to, false) > 0 then
+    return 0
+end
+local ttl = tonumber(ARGV[5])
+local expires_at = now_ms() + ttl
+redis.call(
+    'ZADD', KEYS[1], expires_at,
+    ARGV[1] .. ':' .. ARGV[2] .. ':' .. ARGV[3] .. ':' .. ARGV[4]
+)
+if redis.call('PTTL', KEYS[1]) < ttl then
+    redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return expires_at
+"""
+
+CHECK_HOLDS_SCRIPT = HOLD_FUNCTIONS + """
+local date_from, date_to = tonumber(ARGV[2]), tonumber(ARGV[3])
+return #find_holds(KEYS[1], ARGV[1], date_from, date_to, false) == 0 and 1 or 0
+"""
+
+RELEASE_HOLD_SCRIPT = """
+local prefix = ARGV[1] .. ':' .. ARGV[2] .. ':'
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    if string.sub(member, 1, #prefix) == prefix then
+        return redis.call('ZREM', KEYS[1], member)
+    end
+end
+return 0
+"""
+
+
+class BookingHolds:
+    def __init__(self, client: Redis):
+        """
+        Initialization the booking holds.
+        :param client: Redis client.
+        """
+        self.client = client
+        self.place_script = client.register_script(PLACE_HOLD_SCRIPT)
+        self.check_script = client.register_script(CHECK_HOLDS_SCRIPT)
+        self.release_script = client.register_script(RELEASE_HOLD_SCRIPT)
+
+    @staticmethod
+    def get_key(book_id: int) -> str:
+        """
+        Getting the key of the holds of a book.
+        :param book_id: Book ID.
+        :return: Redis key.
+        """
+        return f"bookings:holds:{book_id}"
+
+    async def place(
+        self,
+        hold_id: str,
+        book_id: int,
+        user_id: int,
+        date_from: date,
+        date_to: date,
+        ttl_ms: int,
+    ) -> int | None:
+        """
+        Holding the book on the requested dates
+        if it is not held by other users.
+        :param hold_id: Hold ID.
+        :param book_id: Book ID.
+        :param user_id: User ID.
+        :param date_from: Start date.
+        :param date_to: End date.
+        :param ttl_ms: Hold lifetime in milliseconds.
+        :return: Expiry time in milliseconds
+                 or None if the book is held.
+        """
+        expires_at = await self.place_script(
+            keys=[self.get_key(book_id)],
+            args=[
+                hold_id,
+                user_id,
+                date_from.toordinal(),
+                date_to.toordinal(),
+                ttl_ms,
+            ],
+        )
+        return expires_at or None
+
+    async def is_free(
+        self,
+        book_id: int,
+        user_id: int,
+        date_from: date,
+        date_to: date,
+    ) -> bool:
+        """
+        Checking that the book is not held
+        by other users on the requested dates.
+        :param book_id: Book ID.
+        :param user_id: User ID.
+        :param date_from: Start date.
+        :param date_to: End date.
+        :return: True if the book is free.
+        """
+        is_free = await self.check_script(
+            keys=[self.get_key(book_id)],
+            args=[user_id, date_from.toordinal(), date_to.toordinal()],
+        )
+        return bool(is_free)
+
+    async def find_held(
+        self,
+        periods: Sequence[tuple[int, int, date, date]],
+    ) -> list[bool]:
+        """
+        Checking many books at once with a single round trip.
+        :param periods: Book ID, user ID, start and end dates
+                        of every requested booking.
+        :return: Whether every booking is held by other users.
+        """
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for book_id, user_id, date_from, date_to in periods:
+                await self.check_script(
+                    keys=[self.get_key(book_id)],
+                    args=[user_id, date_from.toordinal(), date_to.toordinal()],
+                    client=pipeline,
+                )
+            is_free = await pipeline.execute()
+        return [not free for free in is_free]
+
+    async def release(
+        self,
+        hold_id: str,
+        book_id: int,
+        user_id: int,
+    ) -> bool:
+        """
+        Releasing a hold of the user.
+        :param hold_id: Hold ID.
+        :param book_id: Book ID.
+        :param user_id: User ID.
+        :return: True if the hold was released.
+        """
+        released = await self.release_script(
+            keys=[self.get_key(book_id)],
+            args=[hold_id, user_id],
+        )
+        return bool(released)
+
+
+booking_holds = BookingHolds(redis_client)
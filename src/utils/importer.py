@@ -0,0 +1,94 @@
+import csv
+import json
+from itertools import islice
+from typing import (
+    Iterable,
+    Iterator,
+)
+
+from src.schemas.imports import ImportFormat
+from src.utils.export import LIST_SEPARATOR
+
+BOOKS_FEED_COLUMNS = (
+    "name",
+    "price",
+    "author_first_name",
+    "author_last_name",
+    "genres",
+)
+
+
+def to_book_record(row: dict) -> tuple | None:
+    """
+    Converting a feed row to a staging table record.
+    Genres are a list in JSONL and are joined
+    with `LIST_SEPARATOR` in CSV.
+    :param row: Feed row.
+    :return: Record in the order of `BOOKS_FEED_COLUMNS`
+             or None if the row is invalid.
+    """
+    try:
+        genres = row.get("genres") or []
+        if isinstance(genres, str):
+            genres = genres.split(LIST_SEPARATOR)
+        return (
+            str(row["name"]),
+            float(row["price"]),
+            str(row["author_first_name"]),
+            str(row["author_last_name"]),
+            [str(genre) for genre in genres],
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def to_jsonl_book_record(line: str) -> tuple | None:
+    """
+    Parsing a JSONL feed line to a staging table record.
+    Malformed lines and values that are not objects are invalid rows.
+    :param line: Feed line.
+    :return: Record in the order of `BOOKS_FEED_COLUMNS`
+             or None if the line is invalid.
+    """
+    try:
+        row = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(row, dict):
+        return None
+    return to_book_record(row)
+
+
+def chunked(rows: Iterable, chunk_size: int) -> Iterator[list]:
+    """
+    Splitting rows into lists of a fixed size.
+    :param rows: Rows.
+    :param chunk_size: Number of rows per chunk.
+    :return: Chunks of rows.
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def read_books_feed(
+    path: str,
+    file_format: ImportFormat,
+    chunk_size: int,
+) -> Iterator[list[tuple | None]]:
+    """
+    Reading a books feed file lazily in chunks.
+    :param path: Path to the feed file.
+    :param file_format: Feed format.
+    :param chunk_size: Number of rows per chunk.
+    :return: Chunks of staging table records, None for invalid rows.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == ImportFormat.CSV:
+            records = map(to_book_record, csv.DictReader(file))
+        else:
+            records = map(
+                to_jsonl_book_record,
+                (line for line in file if line.strip()),
+            )
+        yield from chunked(records, chunk_size)
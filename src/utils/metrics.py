@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+
+from src.config.config import settings
+from src.schemas.metrics import (
+    BookLockStatsSchema,
+    CacheStatsSchema,
+    LockMetricsSchema,
+    SingleFlightStatsSchema,
+)
+
+
+@dataclass
+class LockStats:
+    acquired: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def observe(self, wait: float, acquired: bool) -> None:
+        """
+        Recording a lock wait.
+        :param wait: Wait time in seconds.
+        :param acquired: Whether the lock was acquired.
+        :return: None.
+        """
+        if acquired:
+            self.acquired += 1
+        else:
+            self.timeouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    def get_snapshot(self, name: str) -> CacheStatsSchema:
+        """
+        Getting the cache counters with the hit ratio of both tiers.
+        :param name: Cache name.
+        :return: Pydantic model representing the cache counters.
+        """
+        hits = self.local_hits + self.hits
+        lookups = hits + self.misses
+        return CacheStatsSchema(
+            name=name,
+            local_hits=self.local_hits,
+            hits=self.hits,
+            misses=self.misses,
+            errors=self.errors,
+            hit_ratio=hits / lookups if lookups else None,
+        )
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    merged: int = 0
+    timeouts: int = 0
+    abandoned: int = 0
+
+    def get_snapshot(self, name: str) -> SingleFlightStatsSchema:
+        """
+        Getting the coalescing counters.
+        :param name: Read name.
+        :return: Pydantic model representing the coalescing counters.
+        """
+        return SingleFlightStatsSchema(
+            name=name,
+            leaders=self.leaders,
+            merged=self.merged,
+            timeouts=self.timeouts,
+            abandoned=self.abandoned,
+        )
+
+
+class LockMetrics:
+    def __init__(self, max_keys: int = settings.bookings.LOCK_METRICS_MAX_KEYS):
+        """
+        Initialization the lock metrics of the process.
+        At most `max_keys` keys are tracked: a new key replaces
+        the one with the least total wait time,
+        which is then only counted in the totals.
+        :param max_keys: Maximum number of tracked keys.
+        """
+        self.max_keys = max_keys
+        self.total = LockStats()
+        self.keys: dict[int, LockStats] = {}
+        self.evicted = 0
+
+    def observe(self, key: int, wait: float, acquired: bool) -> None:
+        """
+        Recording a lock wait of a key.
+        :param key: Locked object ID.
+        :param wait: Wait time in seconds.
+        :param acquired: Whether the lock was acquired.
+        :return: None.
+        """
+        self.total.observe(wait, acquired)
+        stats = self.keys.get(key)
+        if stats is None:
+            if len(self.keys) >= self.max_keys:
+                coldest = min(
+                    self.keys,
+                    key=lambda item: self.keys[item].wait_total,
+                )
+                del self.keys[coldest]
+                self.evicted += 1
+            stats = self.keys[key] = LockStats()
+        stats.observe(wait, acquired)
+
+    def get_snapshot(self, mode: str, top: int) -> LockMetricsSchema:
+        """
+        Getting the lock metrics with the most contended keys,
+        sorted by the total wait time.
+        :param mode: Lock mode.
+        :param top: Number of keys.
+        :return: Pydantic model representing the lock metrics.
+        """
+        hottest = sorted(
+            self.keys.items(),
+            key=lambda item: item[1].wait_total,
+            reverse=True,
+        )[:top]
+        return LockMetricsSchema(
+            mode=mode,
+            acquired=self.total.acquired,
+            timeouts=self.total.timeouts,
+            wait_total_ms=self.total.wait_total * 1000,
+            evicted_books=self.evicted,
+            books=[
+                BookLockStatsSchema(
+                    book_id=key,
+                    acquired=stats.acquired,
+                    timeouts=stats.timeouts,
+                    wait_total_ms=stats.wait_total * 1000,
+                    wait_max_ms=stats.wait_max * 1000,
+                )
+                for key, stats in hottest
+            ],
+        )
+
+    def reset(self) -> None:
+        """
+        Resetting the lock metrics.
+        :return: None.
+        """
+        self.total = LockStats()
+        self.keys.clear()
+        self.evicted = 0
+
+
+booking_lock_metrics = LockMetrics()
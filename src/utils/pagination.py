@@ -0,0 +1,58 @@
+from typing import (
+    Generic,
+    TypeVar,
+)
+
+from src.exceptions.pagination import PageNotFoundException
+from src.schemas.pagination import (
+    BasePaginationResponse,
+    PaginationParams,
+    TotalSchema,
+)
+
+T = TypeVar("T")
+
+
+class Paginator(Generic[T]):
+    def __init__(
+        self,
+        items: list[T],
+        params: PaginationParams,
+        total: TotalSchema | None,
+    ):
+        """
+        Initialization the paginator.
+        :param items: Page rows fetched with `params.limit`.
+        :param params: Pagination params.
+        :param total: Total number of items, None if it was not counted.
+        """
+        self.items = items
+        self.params = params
+        self.total = total
+
+    def paginate(self) -> list[T]:
+        return self.items[:self.params.size]
+
+    def get_pages(self) -> int | None:
+        if self.total is None:
+            return None
+        return self.total.value // self.params.size + bool(
+            self.total.value % self.params.size
+        )
+
+    def get_response(self) -> BasePaginationResponse:
+        items = self.paginate()
+        is_keyset = self.params.after_id is not None
+        if not is_keyset and not items and self.params.page > 1:
+            raise PageNotFoundException
+
+        has_next = len(self.items) > self.params.size
+        return BasePaginationResponse[T](
+            items=items,
+            total=self.total.value if self.total else None,
+            total_relation=self.total.relation if self.total else None,
+            page=None if is_keyset else self.params.page,
+            size=self.params.size,
+            pages=self.get_pages(),
+            next_after_id=items[-1].id if has_next else None,
+        )
@@ -1,10 +1,44 @@
+from typing import (
+    AsyncIterator,
+    Sequence,
+)
+
 from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Select,
+    Text,
+    case,
+    cast,
+    column,
     delete,
+    func,
     insert,
     select,
+    table,
     update,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+from src.config.config import settings
+from src.schemas.pagination import (
+    CountStrategy,
+    TotalRelation,
+    TotalSchema,
+)
+
+pg_class = table(
+    "pg_class",
+    column("oid"),
+    column("relkind"),
+    column("reltuples"),
+)
+pg_inherits = table(
+    "pg_inherits",
+    column("inhrelid"),
+    column("inhparent"),
+)
 
 
 class BaseRepository:
@@ -31,6 +65,20 @@ class BaseRepository:
         result = await self.session.execute(statement)
         return result.scalar_one()
 
+    async def add_many(self, data: list[dict]) -> list[int]:
+        """
+        Adding objects to the database with
+        a multi-row INSERT ... RETURNING.
+        :param data: List of objects data.
+        :return: IDs of the created objects in the order of the data.
+        """
+        statement = (
+            insert(self.model)
+            .returning(self.model.id, sort_by_parameter_order=True)
+        )
+        result = await self.session.execute(statement, data)
+        return list(result.scalars())
+
     async def delete_one(self, obj_id: int) -> None:
         """
         Deleting an object from the database by ID.
@@ -59,25 +107,217 @@ class BaseRepository:
         result = await self.session.execute(statement)
         return result.scalar_one()
 
-    async def find_one(self, **filter_by):
+    async def find_existing_ids(self, obj_ids: list[int]) -> set[int]:
+        """
+        Search for the IDs of existing objects.
+        :param obj_ids: Objects IDs.
+        :return: Set of existing IDs.
+        """
+        statement = (
+            select(self.model.id)
+            .filter(self.model.id.in_(set(obj_ids)))
+        )
+        result = await self.session.execute(statement)
+        return set(result.scalars())
+
+    async def find_one(
+        self,
+        load: Sequence[ExecutableOption] = (),
+        **filter_by,
+    ):
         """
         Search for an object by filters in the database.
+        :param load: Relationship loading options for this query.
         :param filter_by: Filters.
         :return: Object model.
         """
         statement = (
             select(self.model)
             .filter_by(**filter_by)
+            .options(*load)
         )
         result = await self.session.execute(statement)
         return result.scalar_one().to_read_model()
 
-    async def find_all(self):
+    async def find_all(
+        self,
+        *filters: ColumnElement[bool],
+        limit: int | None = None,
+        offset: int | None = None,
+        after_id: int | None = None,
+        load: Sequence[ExecutableOption] = (),
+    ):
         """
-        Getting all objects from the database.
+        Getting objects from the database ordered by ID.
+        :param filters: Filter expressions.
+        :param limit: Maximum number of objects.
+        :param offset: Number of objects to skip.
+        :param after_id: ID after which objects are returned
+                         (keyset pagination, takes precedence over offset).
+        :param load: Relationship loading options for this query.
         :return: List of objects models.
         """
-        statement = select(self.model)
+        statement = self.paginate(
+            select(self.model).filter(*filters).options(*load),
+            limit,
+            offset,
+            after_id,
+        )
         result = await self.session.execute(statement)
         result = [row[0].to_read_model() for row in result.all()]
         return result
+
+    async def stream_all(
+        self,
+        *filters: ColumnElement[bool],
+        chunk_size: int,
+        load: Sequence[ExecutableOption] = (),
+    ) -> AsyncIterator[list]:
+        """
+        Reading objects from the database ordered by ID
+        through a server-side cursor in fixed-size chunks.
+        :param filters: Filter expressions.
+        :param chunk_size: Number of objects per chunk.
+        :param load: Relationship loading options for this query.
+        :return: Chunks of objects models.
+        """
+        statement = (
+            select(self.model)
+            .filter(*filters)
+            .options(*load)
+            .order_by(self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream_scalars(statement)
+        async for partition in result.partitions():
+            yield [row.to_read_model() for row in partition]
+
+    async def count(
+        self,
+        *filters: ColumnElement[bool],
+        cap: int | None = None,
+    ) -> int:
+        """
+        Counting objects in the database.
+        :param filters: Filter expressions.
+        :param cap: Maximum number of objects to count.
+        :return: Number of objects.
+        """
+        if cap is None:
+            statement = (
+                select(func.count())
+                .select_from(self.model)
+                .filter(*filters)
+            )
+        else:
+            subquery = (
+                select(self.model.id)
+                .filter(*filters)
+                .limit(cap)
+                .subquery()
+            )
+            statement = select(func.count()).select_from(subquery)
+        result = await self.session.execute(statement)
+        return result.scalar_one()
+
+    async def estimate_count(self) -> int | None:
+        """
+        Getting the planner estimate of the number
+        of rows in the table from `pg_class.reltuples`.
+        A partitioned table has no estimate of its own,
+        the estimates of its analyzed partitions are summed.
+        :return: Estimated number of rows
+                 or None if the table has never been analyzed.
+        """
+        table_oid = func.to_regclass(self.model.__tablename__)
+        partition = pg_class.alias("partition")
+        partitions_estimate = (
+            select(func.sum(partition.c.reltuples))
+            .join(pg_inherits, pg_inherits.c.inhrelid == partition.c.oid)
+            .filter(
+                pg_inherits.c.inhparent == table_oid,
+                partition.c.reltuples >= 0,
+            )
+            .scalar_subquery()
+        )
+        estimate = case(
+            (cast(pg_class.c.relkind, Text) == "p", partitions_estimate),
+            else_=pg_class.c.reltuples,
+        )
+        statement = (
+            select(cast(estimate, BigInteger))
+            .filter(pg_class.c.oid == table_oid)
+        )
+        result = await self.session.execute(statement)
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    async def count_total(
+        self,
+        strategy: CountStrategy | None,
+        *filters: ColumnElement[bool],
+    ) -> TotalSchema | None:
+        """
+        Counting objects using the requested strategy.
+        The planner estimate is only available without filters,
+        filtered counts fall back to the capped count.
+        :param strategy: Counting strategy, None to skip the count.
+        :param filters: Filter expressions.
+        :return: Pydantic model representing the total
+                 or None if the count was skipped.
+        """
+        if strategy is None:
+            return None
+
+        if strategy == CountStrategy.ESTIMATED and not filters:
+            estimate = await self.estimate_count()
+            if estimate is not None:
+                return TotalSchema(
+                    value=estimate,
+                    relation=TotalRelation.APPROX,
+                )
+            strategy = CountStrategy.EXACT
+
+        if strategy == CountStrategy.EXACT:
+            return TotalSchema(
+                value=await self.count(*filters),
+                relation=TotalRelation.EQ,
+            )
+
+        cap = settings.pagination.COUNT_CAP
+        value = await self.count(*filters, cap=cap + 1)
+        if value > cap:
+            return TotalSchema(
+                value=cap,
+                relation=TotalRelation.GTE,
+            )
+        return TotalSchema(
+            value=value,
+            relation=TotalRelation.EQ,
+        )
+
+    def paginate(
+        self,
+        statement: Select,
+        limit: int | None = None,
+        offset: int | None = None,
+        after_id: int | None = None,
+    ) -> Select:
+        """
+        Applying the page window to the statement.
+        :param statement: Select statement.
+        :param limit: Maximum number of rows.
+        :param offset: Number of rows to skip.
+        :param after_id: ID after which rows are returned.
+        :return: Select statement limited to one page.
+        """
+        statement = statement.order_by(self.model.id)
+        if after_id is not None:
+            statement = statement.filter(self.model.id > after_id)
+        elif offset:
+            statement = statement.offset(offset)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
@@ -0,0 +1,92 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Hashable,
+    TypeVar,
+)
+
+from src.config.config import settings
+from src.utils.metrics import SingleFlightStats
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        name: str,
+        timeout: float = settings.singleflight.TIMEOUT_SECONDS,
+    ):
+        """
+        Initialization the coalescing of identical concurrent reads
+        of a worker: the first caller of a key runs the read,
+        the callers arriving while it is in flight share its result
+        or its exception.
+        A follower that waits longer than the timeout,
+        or whose leader is cancelled, runs the read itself.
+        :param name: Read name.
+        :param timeout: Maximum wait of a follower in seconds.
+        """
+        self.name = name
+        self.timeout = timeout
+        self.calls: dict[Hashable, asyncio.Future] = {}
+        self.stats = SingleFlightStats()
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Running a read or joining the identical one in flight.
+        :param key: Read key, equal for the identical reads.
+        :param load: Coroutine function running the read.
+        :return: Read result.
+        """
+        future = self.calls.get(key)
+        if future is not None:
+            return await self.follow(future, load)
+
+        future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        self.stats.leaders += 1
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            # The exception is raised by the leader itself,
+            # the future must not report it as never retrieved.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.calls[key]
+
+    async def follow(
+        self,
+        future: asyncio.Future,
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Waiting for the result of the read in flight.
+        :param future: Result of the read in flight.
+        :param load: Coroutine function running the read.
+        :return: Read result.
+        """
+        self.stats.merged += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+        except asyncio.CancelledError:
+            if not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+            self.stats.abandoned += 1
+        return await load()
+
+
+book_reads = SingleFlight("books")
+books_filters_reads = SingleFlight("books-filters")
+single_flights = [book_reads, books_filters_reads]
@@ -1,10 +1,25 @@
 from abc import ABC, abstractmethod
+from typing import (
+    Callable,
+    TypeVar,
+)
 
-from src.db.database import async_session_maker
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from src.db.database import (
+    async_session_maker,
+    get_read_session_maker,
+)
 from src.repositories.bookings import BookingsRepository
 from src.repositories.books import BooksRepository
 from src.repositories.genres import GenresRepository
 from src.repositories.users import UsersRepository
+from src.utils.repository import BaseRepository
+
+RepositoryT = TypeVar("RepositoryT", bound=BaseRepository)
 
 
 class BaseManager(ABC):
@@ -12,6 +27,7 @@ class BaseManager(ABC):
     books_repo: BooksRepository
     genres_repo: GenresRepository
     users_repo: UsersRepository
+    read_only: bool
 
     @abstractmethod
     def __init__(self):
@@ -40,23 +56,85 @@ class BaseManager(ABC):
 
 
 class TransactionManager(BaseManager):
-    def __init__(self):
-        self.session_factory = async_session_maker
+    def __init__(
+        self,
+        session_factory: async_sessionmaker | None = None,
+        read_only: bool = False,
+        on_commit: Callable[[], None] | None = None,
+    ):
+        """
+        Initialization the transaction manager.
+        The session and the repositories are created
+        on first use, nested contexts share them.
+        :param session_factory: Session factory,
+                                the primary or a replica by default.
+        :param read_only: Whether the transaction only reads
+                          and can run on a replica.
+        :param on_commit: Callback called after every successful commit.
+        """
+        if session_factory is None:
+            session_factory = (
+                get_read_session_maker() if read_only else async_session_maker
+            )
+        self.session_factory = session_factory
+        self.read_only = read_only
+        self.on_commit = on_commit
+        self.depth = 0
+        self._session: AsyncSession | None = None
+        self._repositories: dict[type[RepositoryT], RepositoryT] = {}
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    def get_repository(self, repository: type[RepositoryT]) -> RepositoryT:
+        """
+        Getting a repository bound to the session of the transaction.
+        :param repository: Repository class.
+        :return: Repository.
+        """
+        if repository not in self._repositories:
+            self._repositories[repository] = repository(self.session)
+        return self._repositories[repository]
+
+    @property
+    def bookings_repo(self) -> BookingsRepository:
+        return self.get_repository(BookingsRepository)
+
+    @property
+    def books_repo(self) -> BooksRepository:
+        return self.get_repository(BooksRepository)
+
+    @property
+    def genres_repo(self) -> GenresRepository:
+        return self.get_repository(GenresRepository)
+
+    @property
+    def users_repo(self) -> UsersRepository:
+        return self.get_repository(UsersRepository)
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-        self.bookings_repo = BookingsRepository(self.session)
-        self.books_repo = BooksRepository(self.session)
-        self.genres_repo = GenresRepository(self.session)
-        self.users_repo = UsersRepository(self.session)
+        self.depth += 1
         return self
 
     async def __aexit__(self, *args):
-        await self.rollback()
-        await self.session.close()
+        self.depth -= 1
+        if self.depth or self._session is None:
+            return
+        try:
+            await self.rollback()
+        finally:
+            await self._session.close()
+            self._session = None
+            self._repositories.clear()
 
     async def commit(self):
         await self.session.commit()
+        if self.on_commit is not None:
+            self.on_commit()
 
     async def rollback(self):
-        await self.session.rollback()
+        if self._session is not None and self._session.in_transaction():
+            await self._session.rollback()